@@ -9,7 +9,7 @@ import sys
 from pathlib import Path
 import difflib
 from tqdm import tqdm
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 
 # Import our modules
 from languages import detect_languages
@@ -22,7 +22,7 @@ from linters.go_linter import GoLinter
 from linters.rust_linter import RustLinter
 from linters.java_linter import JavaLinter
 from linters.env_manager import EnvironmentManager
-from llm import generate_fix
+from llm import generate_fixes
 from git_utils import create_branch, apply_fixes, push_and_pr, commit_changes
 from logger import setup_logger
 
@@ -63,7 +63,8 @@ def show_issues_for_file(file_path: str, issues: List[Dict[str, Any]]):
         logger.info(f"  Line {issue['row']}, Col {issue['col']}: {issue['code']} - {issue['text']}")
 
 def generate_report(repo_path: Path, languages: Dict[str, List[Path]], all_issues: Dict[str, List[Dict[str, Any]]], 
-                   fixes: Dict[str, str], model: str, runner: str, dry_run: bool, report_path: str) -> None:
+                   fixes: Dict[str, str], model: str, runner: str, dry_run: bool, report_path: str,
+                   issue_annotations: Optional[Dict[str, List[Tuple[str, int, int]]]] = None) -> None:
     """
     Generate a detailed report of the fixing process.
     
@@ -76,6 +77,7 @@ def generate_report(repo_path: Path, languages: Dict[str, List[Path]], all_issue
         runner: LLM runner used
         dry_run: Whether this was a dry run
         report_path: Path to save the report
+        issue_annotations: Classification of each issue per file, if already computed
     """
     try:
         from datetime import datetime
@@ -89,11 +91,14 @@ def generate_report(repo_path: Path, languages: Dict[str, List[Path]], all_issue
         
         # Group issues by type
         all_issues_flat = []
-        for issues in all_issues.values():
+        all_annotations_flat = [] if issue_annotations is not None else None
+        for file_path, issues in all_issues.items():
             all_issues_flat.extend(issues)
+            if all_annotations_flat is not None:
+                all_annotations_flat.extend(issue_annotations[file_path])
         
         from issue_deduplicator import group_issues_by_type
-        grouped_issues = group_issues_by_type(all_issues_flat)
+        grouped_issues = group_issues_by_type(all_issues_flat, all_annotations_flat)
         
         # Create report data
         report_data = {
@@ -361,23 +366,27 @@ def main(repo, branch, model, runner, no_push, dry_run, output, verbose, cleanup
             return
         
         # Deduplicate and prioritize issues
-        from issue_deduplicator import deduplicate_issues, prioritize_issues, filter_issues_by_severity, group_issues_by_type
+        from issue_deduplicator import deduplicate_issues, prioritize_issues_annotated, filter_issues_by_severity_annotated, group_issues_by_type
         
         logger.info("Deduplicating and prioritizing issues...")
         deduplicated_issues = {}
+        issue_annotations = {}  # file path -> classification of each kept issue
         
         for file_path, issues in all_issues.items():
             # Deduplicate issues for this file
             unique_issues = deduplicate_issues(issues)
             
-            # Prioritize issues (most important first)
-            prioritized_issues = prioritize_issues(unique_issues)
+            # Prioritize issues (most important first), classifying each once
+            prioritized_issues, annotations = prioritize_issues_annotated(unique_issues)
             
             # Filter by minimum severity (optional - could be configurable)
-            filtered_issues = filter_issues_by_severity(prioritized_issues, min_severity='low')
+            filtered_issues, annotations = filter_issues_by_severity_annotated(
+                prioritized_issues, min_severity='low', annotations=annotations
+            )
             
             if filtered_issues:
                 deduplicated_issues[file_path] = filtered_issues
+                issue_annotations[file_path] = annotations
         
         all_issues = deduplicated_issues
         total_issues = sum(len(issues) for issues in all_issues.values())
@@ -386,30 +395,23 @@ def main(repo, branch, model, runner, no_push, dry_run, output, verbose, cleanup
         # Show issue breakdown by type
         if verbose:
             all_issues_flat = []
-            for issues in all_issues.values():
+            all_annotations_flat = []
+            for file_path, issues in all_issues.items():
                 all_issues_flat.extend(issues)
+                all_annotations_flat.extend(issue_annotations[file_path])
             
-            grouped = group_issues_by_type(all_issues_flat)
+            grouped = group_issues_by_type(all_issues_flat, all_annotations_flat)
             logger.info("Issue breakdown by type:")
             for issue_type, type_issues in grouped.items():
                 logger.info(f"  {issue_type}: {len(type_issues)} issues")
         
-        # Phase 3: Generate fixes using LLM
+        # Phase 3: Generate fixes using LLM (several files in flight at once)
         logger.info("Generating fixes using LLM...")
-        fixes = {}
-        
-        # Try to use tqdm for progress bar
-        try:
-            progress_bar = tqdm(all_issues.items(), desc="Generating fixes", unit="file")
-        except ImportError:
-            progress_bar = all_issues.items()
+        with tqdm(total=len(all_issues), desc="Generating fixes", unit="file") as pbar:
+            fixes = generate_fixes(all_issues.items(), model, runner, timeout, retries, progress=pbar.update)
         
-        for file_path, issues in progress_bar:
-            logger.debug(f"Generating fix for {file_path}")
-            fix = generate_fix(Path(file_path), issues, model, runner, timeout, retries)
-            if fix:
-                fixes[file_path] = fix
-            else:
+        for file_path in all_issues:
+            if file_path not in fixes:
                 logger.warning(f"Failed to generate fix for {file_path}")
         
         total_issues = sum(len(issues) for issues in all_issues.values())
@@ -528,7 +530,7 @@ def main(repo, branch, model, runner, no_push, dry_run, output, verbose, cleanup
         
         # Generate report if requested
         if report:
-            generate_report(repo_path, languages, all_issues, fixes, model, runner, dry_run, report)
+            generate_report(repo_path, languages, all_issues, fixes, model, runner, dry_run, report, issue_annotations)
         
     except Exception as e:
         logger.error(f"CodeFixer failed: {e}")
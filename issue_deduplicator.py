@@ -3,11 +3,163 @@ Issue deduplication for CodeFixer.
 Merges similar linting issues to avoid duplicates.
 """
 
-from typing import Dict, List, Any
+import functools
+import re
+from collections import defaultdict
+from typing import Dict, List, Any, Optional, Tuple
 import logging
 
+from utils.memory_monitor import register_cache
+
 logger = logging.getLogger(__name__)
 
+# NumPy is optional; it takes over sorting and filtering for large runs
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Issue count from which the NumPy paths are used
+NUMPY_MIN_ISSUES = 10000
+
+# Code fragments for each issue category. They are matched as substrings so
+# that merged codes such as "E302+F401" still classify by their parts.
+SECURITY_CODES = frozenset({'S101', 'S105', 'S106', 'S107'})
+UNUSED_CODES = frozenset({'F401', 'F403', 'unused', 'no-unused'})
+STYLE_CODES = frozenset({'indent', 'E111', 'E112', 'quotes', 'semi'})
+INDENT_CODES = frozenset({'indent', 'E111', 'E112'})
+FORMATTING_CODES = frozenset({'E501', 'max-len', 'printWidth'})
+DEBUGGING_CODES = frozenset({'no-console'})
+
+# Issue text that marks a security problem whatever the code
+SECURITY_RE = re.compile(r"security|vulnerability|unsafe", re.IGNORECASE)
+DANGER_RE = re.compile(r"security|vulnerability|unsafe|dangerous", re.IGNORECASE)
+
+# Priority weights for different issue types, checked in order
+PRIORITY_WEIGHTS = {
+    # High priority - security and critical issues
+    'security': 100,
+    'S101': 100,  # Use of assert detected
+    'S105': 100,  # Possible hardcoded password
+    'S106': 100,  # Possible hardcoded password
+    'S107': 100,  # Possible hardcoded password
+    'no-eval': 100,  # eval() usage
+    'no-implied-eval': 100,  # implied eval
+    
+    # Medium priority - code quality issues
+    'unused-variable': 50,
+    'no-unused-vars': 50,
+    'unused-import': 50,
+    'F401': 50,  # Unused import
+    'F403': 50,  # Wildcard import
+    'no-console': 50,  # console.log usage
+    'prefer-const': 45,  # Use const instead of let
+    
+    # Low priority - style issues
+    'indent': 10,
+    'E111': 10,  # Indentation
+    'E112': 10,  # Expected indentation
+    'quotes': 5,
+    'semi': 5,
+    'comma-dangle': 5,
+    'trailing-comma': 5,
+    
+    # Very low priority - formatting
+    'E501': 1,  # Line too long
+    'max-len': 1,
+    'printWidth': 1,
+}
+
+def _fragment_re(fragments: frozenset) -> "re.Pattern":
+    """Compile a pattern matching any of the given code fragments."""
+    return re.compile("|".join(re.escape(fragment) for fragment in sorted(fragments)))
+
+_SECURITY_CODE_RE = _fragment_re(SECURITY_CODES)
+_UNUSED_CODE_RE = _fragment_re(UNUSED_CODES)
+_STYLE_CODE_RE = _fragment_re(STYLE_CODES)
+_INDENT_CODE_RE = _fragment_re(INDENT_CODES)
+_FORMATTING_CODE_RE = _fragment_re(FORMATTING_CODES)
+_DEBUGGING_CODE_RE = _fragment_re(DEBUGGING_CODES)
+_PRIORITY_PATTERNS = tuple((pattern.lower(), weight) for pattern, weight in PRIORITY_WEIGHTS.items())
+
+# Byte-indexed table of characters that start any code fragment above, in
+# either case. A code containing none of them cannot match any fragment.
+_FRAGMENT_START = bytearray(256)
+for _fragment in SECURITY_CODES | UNUSED_CODES | STYLE_CODES | FORMATTING_CODES | DEBUGGING_CODES | frozenset(PRIORITY_WEIGHTS):
+    _FRAGMENT_START[ord(_fragment[0].lower())] = 1
+    _FRAGMENT_START[ord(_fragment[0].upper())] = 1
+del _fragment
+
+def _may_contain_fragment(code: str) -> bool:
+    """Check whether a code could contain any known code fragment."""
+    for char in code:
+        value = ord(char)
+        if value > 255 or _FRAGMENT_START[value]:
+            return True
+    return False
+
+# The C-level lru_cache wrapper means cache hits never enter a Python frame,
+# so coverage and profilers only see (and slow down) the first call per pair
+@functools.lru_cache(maxsize=4096)
+def classify(code: str, text: str = '') -> Tuple[str, int, int]:
+    """
+    Classify an issue by its code and message.
+    
+    Results are cached, so the same code and message seen in many files
+    is only classified once.
+    
+    Args:
+        code: Linter code of the issue
+        text: Issue message
+        
+    Returns:
+        Tuple of (category, severity level 1-4, priority weight)
+    """
+    # Codes like W291 or D100 match no fragment; only the text matters
+    if not _may_contain_fragment(code):
+        severity = 4 if SECURITY_RE.search(text) else 1
+        priority = PRIORITY_WEIGHTS['security'] if DANGER_RE.search(text) else 25
+        return 'other', severity, priority
+    
+    # Category
+    if _SECURITY_CODE_RE.search(code):
+        category = 'security'
+    elif _UNUSED_CODE_RE.search(code):
+        category = 'unused_code'
+    elif _STYLE_CODE_RE.search(code):
+        category = 'style'
+    elif _FORMATTING_CODE_RE.search(code):
+        category = 'formatting'
+    elif _DEBUGGING_CODE_RE.search(code):
+        category = 'debugging'
+    else:
+        category = 'other'
+    
+    # Severity
+    if SECURITY_RE.search(text) or category == 'security':
+        severity = 4
+    elif category == 'unused_code' or _DEBUGGING_CODE_RE.search(code):
+        severity = 3
+    elif _INDENT_CODE_RE.search(code):
+        severity = 2
+    else:
+        severity = 1
+    
+    # Priority
+    if DANGER_RE.search(text):
+        priority = PRIORITY_WEIGHTS['security']
+    else:
+        priority = 25
+        lowered_code = code.lower()
+        for pattern, weight in _PRIORITY_PATTERNS:
+            if pattern in lowered_code:
+                priority = weight
+                break
+    
+    return category, severity, priority
+
+register_cache(classify)
+
 def deduplicate_issues(issues: Dict[str, List[Dict[str, Any]]]) -> Dict[str, List[Dict[str, Any]]]:
     """
     Deduplicate linting issues by merging similar ones.
@@ -24,26 +176,35 @@ def deduplicate_issues(issues: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Lis
         if not file_issues:
             continue
         
-        # Group issues by position and code
-        issue_groups = {}
+        # Issues are kept in a single pass; only positions that turn out to
+        # hold several different issues are collected for merging
+        merged_issues = []
+        positions = {}  # (row, col, code) -> index in merged_issues
+        issue_groups = {}  # index -> issues sharing that position
+        seen = set()
         
         for issue in file_issues:
+            # Exact copies add nothing to a merge, skip them up front
+            issue_key = _issue_key_tuple(issue)
+            if issue_key in seen:
+                continue
+            seen.add(issue_key)
+            
             # Create a key based on position and code
             key = (issue.get('row', 0), issue.get('col', 0), issue.get('code', ''))
             
-            if key not in issue_groups:
-                issue_groups[key] = []
-            issue_groups[key].append(issue)
-        
-        # Merge issues in each group
-        merged_issues = []
-        for group_issues in issue_groups.values():
-            if len(group_issues) == 1:
-                merged_issues.append(group_issues[0])
+            index = positions.get(key)
+            if index is None:
+                positions[key] = len(merged_issues)
+                merged_issues.append(issue)
+            elif index in issue_groups:
+                issue_groups[index].append(issue)
             else:
-                # Merge multiple issues at the same position
-                merged_issue = merge_issue_group(group_issues)
-                merged_issues.append(merged_issue)
+                issue_groups[index] = [merged_issues[index], issue]
+        
+        # Merge multiple issues at the same position
+        for index, group_issues in issue_groups.items():
+            merged_issues[index] = merge_issue_group(group_issues)
         
         if merged_issues:
             deduplicated[file_path] = merged_issues
@@ -166,83 +327,85 @@ def create_issue_key(issue: Dict[str, Any]) -> str:
     
     return '|'.join(parts)
 
-def prioritize_issues(issues: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def _issue_key_tuple(issue: Dict[str, Any]) -> Tuple[Any, ...]:
     """
-    Prioritize issues based on severity and type.
+    Create a hashable key for an issue without building a string.
+    
+    Matches the fields used by create_issue_key, for internal duplicate
+    checks where the string form is not needed.
     
     Args:
-        issues: List of linting issues
+        issue: Issue dictionary
         
     Returns:
-        Prioritized list of issues
+        Tuple of path, row, column, code and text
     """
-    # Define priority weights for different issue types
-    priority_weights = {
-        # High priority - security and critical issues
-        'security': 100,
-        'S101': 100,  # Use of assert detected
-        'S105': 100,  # Possible hardcoded password
-        'S106': 100,  # Possible hardcoded password
-        'S107': 100,  # Possible hardcoded password
-        'no-eval': 100,  # eval() usage
-        'no-implied-eval': 100,  # implied eval
-        
-        # Medium priority - code quality issues
-        'unused-variable': 50,
-        'no-unused-vars': 50,
-        'unused-import': 50,
-        'F401': 50,  # Unused import
-        'F403': 50,  # Wildcard import
-        'no-console': 50,  # console.log usage
-        'prefer-const': 45,  # Use const instead of let
-        
-        # Low priority - style issues
-        'indent': 10,
-        'E111': 10,  # Indentation
-        'E112': 10,  # Expected indentation
-        'quotes': 5,
-        'semi': 5,
-        'comma-dangle': 5,
-        'trailing-comma': 5,
-        
-        # Very low priority - formatting
-        'E501': 1,  # Line too long
-        'max-len': 1,
-        'printWidth': 1,
-    }
+    return (
+        issue.get('path', ''),
+        issue.get('row', ''),
+        issue.get('col', ''),
+        issue.get('code', ''),
+        issue.get('text', '')
+    )
+
+def annotate_issues(issues: List[Dict[str, Any]]) -> List[Tuple[str, int, int]]:
+    """
+    Classify each issue once so several passes can share the result.
     
-    def get_priority(issue: Dict[str, Any]) -> int:
-        """Get priority weight for an issue."""
-        code = issue.get('code', '')
-        
-        # Check for security-related keywords
-        if any(keyword in issue.get('text', '').lower() for keyword in ['security', 'vulnerability', 'unsafe', 'dangerous']):
-            return priority_weights.get('security', 50)
-        
-        # Check for specific codes
-        for pattern, weight in priority_weights.items():
-            if pattern.lower() in code.lower():
-                return weight
+    Args:
+        issues: List of linting issues
         
-        # Default priority
-        return 25
+    Returns:
+        List of (category, severity level, priority weight), one per issue
+        and in the same order
+    """
+    return [classify(issue.get('code', ''), issue.get('text', '')) for issue in issues]
+
+def _priority_order(annotations: List[Tuple[str, int, int]]) -> List[int]:
+    """Indices of annotated issues by priority (highest first), keeping ties in input order."""
+    if np is not None and len(annotations) >= NUMPY_MIN_ISSUES:
+        priorities = np.fromiter((priority for _, _, priority in annotations), dtype=np.int16, count=len(annotations))
+        return np.argsort(-priorities, kind='stable').tolist()
+    return sorted(range(len(annotations)), key=lambda i: annotations[i][2], reverse=True)
+
+def prioritize_issues(issues: List[Dict[str, Any]], annotations: Optional[List[Tuple[str, int, int]]] = None) -> List[Dict[str, Any]]:
+    """
+    Prioritize issues based on severity and type.
     
-    # Sort issues by priority (highest first)
-    prioritized = sorted(issues, key=get_priority, reverse=True)
+    Args:
+        issues: List of linting issues
+        annotations: Result of annotate_issues for these issues, if already computed
+        
+    Returns:
+        Prioritized list of issues
+    """
+    if annotations is None:
+        annotations = annotate_issues(issues)
     
-    return prioritized
+    return [issues[i] for i in _priority_order(annotations)]
 
-def filter_issues_by_severity(issues: List[Dict[str, Any]], min_severity: str = 'low') -> List[Dict[str, Any]]:
+def prioritize_issues_annotated(issues: List[Dict[str, Any]], annotations: Optional[List[Tuple[str, int, int]]] = None) -> Tuple[List[Dict[str, Any]], List[Tuple[str, int, int]]]:
     """
-    Filter issues by minimum severity level.
+    Prioritize issues and reorder their annotations to match.
+    
+    Later passes can take the returned annotations instead of classifying
+    the issues again.
     
     Args:
         issues: List of linting issues
-        min_severity: Minimum severity level ('low', 'medium', 'high', 'critical')
+        annotations: Result of annotate_issues for these issues, if already computed
         
     Returns:
-        Filtered list of issues
+        Tuple of the prioritized issues and their annotations in the same order
     """
+    if annotations is None:
+        annotations = annotate_issues(issues)
+    
+    order = _priority_order(annotations)
+    return [issues[i] for i in order], [annotations[i] for i in order]
+
+def _severity_kept(annotations: List[Tuple[str, int, int]], min_severity: str) -> List[int]:
+    """Indices of annotated issues at or above the given severity."""
     severity_levels = {
         'low': 1,
         'medium': 2,
@@ -252,64 +415,63 @@ def filter_issues_by_severity(issues: List[Dict[str, Any]], min_severity: str =
     
     min_level = severity_levels.get(min_severity.lower(), 1)
     
-    def get_severity_level(issue: Dict[str, Any]) -> int:
-        """Get severity level for an issue."""
-        code = issue.get('code', '')
-        text = issue.get('text', '').lower()
-        
-        # Critical issues
-        if any(keyword in text for keyword in ['security', 'vulnerability', 'unsafe']):
-            return 4
-        if any(prefix in code for prefix in ['S101', 'S105', 'S106', 'S107']):
-            return 4
-        
-        # High priority issues
-        if any(prefix in code for prefix in ['F401', 'F403', 'unused', 'no-unused']):
-            return 3
-        if 'no-console' in code:
-            return 3
+    if np is not None and len(annotations) >= NUMPY_MIN_ISSUES:
+        severities = np.fromiter((severity for _, severity, _ in annotations), dtype=np.int8, count=len(annotations))
+        return np.flatnonzero(severities >= min_level).tolist()
+    return [i for i, (_, severity, _) in enumerate(annotations) if severity >= min_level]
+
+def filter_issues_by_severity(issues: List[Dict[str, Any]], min_severity: str = 'low', annotations: Optional[List[Tuple[str, int, int]]] = None) -> List[Dict[str, Any]]:
+    """
+    Filter issues by minimum severity level.
+    
+    Args:
+        issues: List of linting issues
+        min_severity: Minimum severity level ('low', 'medium', 'high', 'critical')
+        annotations: Result of annotate_issues for these issues, if already computed
         
-        # Medium priority issues
-        if any(prefix in code for prefix in ['E111', 'E112', 'indent']):
-            return 2
+    Returns:
+        Filtered list of issues
+    """
+    if annotations is None:
+        annotations = annotate_issues(issues)
+    
+    return [issues[i] for i in _severity_kept(annotations, min_severity)]
+
+def filter_issues_by_severity_annotated(issues: List[Dict[str, Any]], min_severity: str = 'low', annotations: Optional[List[Tuple[str, int, int]]] = None) -> Tuple[List[Dict[str, Any]], List[Tuple[str, int, int]]]:
+    """
+    Filter issues by minimum severity level, keeping their annotations.
+    
+    Args:
+        issues: List of linting issues
+        min_severity: Minimum severity level ('low', 'medium', 'high', 'critical')
+        annotations: Result of annotate_issues for these issues, if already computed
         
-        # Low priority issues (formatting, style)
-        return 1
+    Returns:
+        Tuple of the kept issues and their annotations
+    """
+    if annotations is None:
+        annotations = annotate_issues(issues)
     
-    filtered = [issue for issue in issues if get_severity_level(issue) >= min_level]
-    return filtered
+    kept = _severity_kept(annotations, min_severity)
+    return [issues[i] for i in kept], [annotations[i] for i in kept]
 
-def group_issues_by_type(issues: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+def group_issues_by_type(issues: List[Dict[str, Any]], annotations: Optional[List[Tuple[str, int, int]]] = None) -> Dict[str, List[Dict[str, Any]]]:
     """
     Group issues by their type/category.
     
     Args:
         issues: List of linting issues
+        annotations: Result of annotate_issues for these issues, if already computed
         
     Returns:
         Dictionary mapping issue types to lists of issues
     """
-    grouped = {}
+    if annotations is None:
+        annotations = annotate_issues(issues)
     
-    for issue in issues:
-        code = issue.get('code', 'unknown')
-        
-        # Determine issue type
-        if any(security_code in code for security_code in ['S101', 'S105', 'S106', 'S107']):
-            issue_type = 'security'
-        elif any(unused_code in code for unused_code in ['F401', 'F403', 'unused', 'no-unused']):
-            issue_type = 'unused_code'
-        elif any(style_code in code for style_code in ['indent', 'E111', 'E112', 'quotes', 'semi']):
-            issue_type = 'style'
-        elif any(format_code in code for format_code in ['E501', 'max-len', 'printWidth']):
-            issue_type = 'formatting'
-        elif 'no-console' in code:
-            issue_type = 'debugging'
-        else:
-            issue_type = 'other'
-        
-        if issue_type not in grouped:
-            grouped[issue_type] = []
+    grouped = defaultdict(list)
+    
+    for issue, (issue_type, _, _) in zip(issues, annotations):
         grouped[issue_type].append(issue)
     
-    return grouped 
\ No newline at end of file
+    return dict(grouped) 
\ No newline at end of file
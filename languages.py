@@ -42,6 +42,13 @@ LANGUAGE_EXTENSIONS = {
     'pubspec': ['pubspec.yaml', 'pubspec.lock'],
 }
 
+# Reverse mapping from extension or filename to language, built once at import
+_EXT_TO_LANG = {
+    ext: lang
+    for lang, exts in LANGUAGE_EXTENSIONS.items()
+    for ext in exts
+}
+
 # Files to ignore
 IGNORE_PATTERNS = [
     '.git',
@@ -87,12 +94,7 @@ def detect_languages(repo_path: Path) -> Dict[str, List[Path]]:
         Dictionary mapping language names to lists of file paths
     """
     languages = {}
-    
-    # Create reverse mapping from extension to language (optimized)
-    ext_to_lang = {}
-    for lang, exts in LANGUAGE_EXTENSIONS.items():
-        for ext in exts:
-            ext_to_lang[ext] = lang
+    ext_to_lang = _EXT_TO_LANG
     
     # Use pathlib for more efficient file walking
     try:
@@ -7,6 +7,7 @@ import subprocess
 import json
 import tempfile
 from typing import List, Dict, Any, Optional
+from utils.json_parser import intern_code
 from .env_manager import EnvironmentManager
 
 
@@ -208,7 +209,7 @@ issues:
                             "line": issue.get("Pos", {}).get("Line", 0),
                             "column": issue.get("Pos", {}).get("Column", 0),
                             "message": issue.get("Text", ""),
-                            "code": issue.get("FromLinter", ""),
+                            "code": intern_code(issue.get("FromLinter", "")),
                             "severity": self._map_severity(issue.get("Severity", "medium")),
                             "category": self._categorize_issue(issue.get("FromLinter", ""))
                         })
@@ -273,7 +274,7 @@ issues:
                     "line": line_num,
                     "column": col_num,
                     "message": message,
-                    "code": linter,
+                    "code": intern_code(linter),
                     "severity": self._map_severity("medium"),
                     "category": self._categorize_issue(linter)
                 }
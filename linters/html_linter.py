@@ -11,6 +11,7 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+from utils.json_parser import intern_code
 from .env_manager import env_manager
 
 def get_html_temp_dir(repo_path: Path) -> Path:
@@ -81,7 +82,7 @@ def run_htmlhint(file_path: Path, temp_dir: Path) -> List[Dict[str, Any]]:
                         "path": str(file_path),
                         "row": issue.get("line", 1),
                         "col": issue.get("col", 1),
-                        "code": issue.get("rule", "unknown"),
+                        "code": intern_code(issue.get("rule", "unknown")),
                         "text": issue.get("message", "")
                     })
             
@@ -132,7 +133,7 @@ def parse_htmlhint_text_output(output: str, file_path: Path) -> List[Dict[str, A
                     "path": str(file_path),
                     "row": line_num,
                     "col": col_num,
-                    "code": rule,
+                    "code": intern_code(rule),
                     "text": message
                 })
             except (ValueError, IndexError):
@@ -140,12 +141,12 @@ def parse_htmlhint_text_output(output: str, file_path: Path) -> List[Dict[str, A
     
     return issues
 
-def run_html_linter(files: List[Path], repo_path: Path) -> Dict[str, List[Dict[str, Any]]]:
+def run_html_linter(files: List[Path], repo_path: Path, setup: bool = True) -> Dict[str, List[Dict[str, Any]]]:
     all_issues = {}
     temp_path = get_html_temp_dir(repo_path)
     
     # Setup HTML environment
-    if not setup_html_env(temp_path):
+    if setup and not setup_html_env(temp_path):
         logger.error("Failed to setup HTML environment")
         return all_issues
     
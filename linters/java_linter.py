@@ -7,6 +7,7 @@ import subprocess
 import json
 import xml.etree.ElementTree as ET
 from typing import List, Dict, Any, Optional
+from utils.json_parser import intern_code
 from .env_manager import EnvironmentManager
 
 
@@ -243,7 +244,7 @@ class JavaLinter:
                                     "line": violation.get("beginline", 0),
                                     "column": violation.get("begincolumn", 0),
                                     "message": violation.get("description", ""),
-                                    "code": violation.get("rule", ""),
+                                    "code": intern_code(violation.get("rule", "")),
                                     "severity": self._map_pmd_severity(violation.get("priority", 3)),
                                     "category": self._categorize_pmd_issue(violation.get("rule", ""))
                                 })
@@ -277,7 +278,7 @@ class JavaLinter:
                                     "line": int(error.get("line", 0)),
                                     "column": int(error.get("column", 0)),
                                     "message": error.get("message", ""),
-                                    "code": error.get("source", ""),
+                                    "code": intern_code(error.get("source", "")),
                                     "severity": self._map_checkstyle_severity(error.get("severity", "warning")),
                                     "category": self._categorize_checkstyle_issue(error.get("source", ""))
                                 })
@@ -11,6 +11,7 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+from utils.json_parser import intern_code
 from .env_manager import env_manager
 
 def get_js_temp_dir(repo_path: Path) -> Path:
@@ -87,7 +88,7 @@ def run_eslint(file_path: Path, temp_dir: Path) -> List[Dict[str, Any]]:
                         "path": str(file_path),
                         "row": issue.get("line", 1),
                         "col": issue.get("column", 1),
-                        "code": issue.get("ruleId", "unknown"),
+                        "code": intern_code(issue.get("ruleId", "unknown")),
                         "text": issue.get("message", "")
                     })
             
@@ -135,7 +136,7 @@ def parse_eslint_text_output(output: str, file_path: Path) -> List[Dict[str, Any
                     "path": str(file_path),
                     "row": line_num,
                     "col": col_num,
-                    "code": rule,
+                    "code": intern_code(rule),
                     "text": message
                 })
             except (ValueError, IndexError):
@@ -161,7 +162,7 @@ def parse_eslint_text_output(output: str, file_path: Path) -> List[Dict[str, Any
                         "path": str(file_path),
                         "row": line_num,
                         "col": col_num,
-                        "code": rule,
+                        "code": intern_code(rule),
                         "text": message
                     })
                 except (ValueError, IndexError):
@@ -236,7 +237,7 @@ def run_tslint(file_path: Path, temp_dir: Path) -> List[Dict[str, Any]]:
                     "path": str(file_path),
                     "row": issue.get("startPosition", {}).get("line", 1),
                     "col": issue.get("startPosition", {}).get("character", 1),
-                    "code": issue.get("ruleName", "unknown"),
+                    "code": intern_code(issue.get("ruleName", "unknown")),
                     "text": issue.get("failure", "")
                 })
             
@@ -299,12 +300,12 @@ def parse_tslint_text_output(output: str, file_path: Path) -> List[Dict[str, Any
     
     return issues
 
-def run_js_linter(files: List[Path], repo_path: Path) -> Dict[str, List[Dict[str, Any]]]:
+def run_js_linter(files: List[Path], repo_path: Path, setup: bool = True) -> Dict[str, List[Dict[str, Any]]]:
     all_issues = {}
     temp_path = get_js_temp_dir(repo_path)
     
     # Setup JavaScript environment
-    if not setup_js_env(temp_path):
+    if setup and not setup_js_env(temp_path):
         logger.error("Failed to setup JavaScript environment")
         return all_issues
     
@@ -11,6 +11,7 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+from utils.json_parser import intern_code
 from .env_manager import env_manager
 
 def get_python_temp_dir(repo_path: Path) -> Path:
@@ -89,7 +90,7 @@ def run_flake8(file_path: Path, temp_dir: Path, is_test: bool = False) -> List[D
                     "path": str(file_path),
                     "row": issue.get("line_number", 1),
                     "col": issue.get("column_number", 1),
-                    "code": issue.get("code", "unknown"),
+                    "code": intern_code(issue.get("code", "unknown")),
                     "text": issue.get("text", "")
                 })
             
@@ -127,7 +128,7 @@ def parse_flake8_text_output(output: str, file_path: Path) -> List[Dict[str, Any
                     "path": str(file_path),
                     "row": line_num,
                     "col": col_num,
-                    "code": code,
+                    "code": intern_code(code),
                     "text": message
                 })
             except (ValueError, IndexError):
@@ -149,7 +150,7 @@ def parse_flake8_text_output(output: str, file_path: Path) -> List[Dict[str, Any
                         "path": str(file_path),
                         "row": line_num,
                         "col": col_num,
-                        "code": code,
+                        "code": intern_code(code),
                         "text": message
                     })
                 except (ValueError, IndexError):
@@ -237,13 +238,15 @@ def parse_mypy_output(output: str, file_path: Path) -> List[Dict[str, Any]]:
     
     return issues
 
-def run_python_linter(files: List[Path], repo_path: Path) -> Dict[str, List[Dict[str, Any]]]:
+def run_python_linter(files: List[Path], repo_path: Path, setup: bool = True) -> Dict[str, List[Dict[str, Any]]]:
     """
     Run Python linters on a list of files.
     
     Args:
         files: List of Python file paths
         repo_path: Path to the repository root
+        setup: Set up the linter environment first; pass False when a
+            caller has already prepared it
         
     Returns:
         Dictionary mapping file paths to lists of linting issues
@@ -252,7 +255,7 @@ def run_python_linter(files: List[Path], repo_path: Path) -> Dict[str, List[Dict
     temp_path = get_python_temp_dir(repo_path)
     
     # Setup Python environment
-    if not setup_python_env(temp_path):
+    if setup and not setup_python_env(temp_path):
         logger.error("Failed to setup Python environment")
         return all_issues
     
@@ -6,6 +6,7 @@ import os
 import subprocess
 import json
 from typing import List, Dict, Any, Optional
+from utils.json_parser import intern_code
 from .env_manager import EnvironmentManager
 
 
@@ -152,7 +153,7 @@ edition = "2021"
                                         "line": span.get("line_start", 0),
                                         "column": span.get("column_start", 0),
                                         "message": message_text,
-                                        "code": code,
+                                        "code": intern_code(code),
                                         "severity": self._map_severity(level),
                                         "category": self._categorize_issue(code)
                                     })
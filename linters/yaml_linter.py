@@ -11,6 +11,7 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+from utils.json_parser import intern_code
 from .env_manager import env_manager
 
 def get_yaml_temp_dir(repo_path: Path) -> Path:
@@ -116,7 +117,7 @@ def parse_yamllint_output(output: str, file_path: Path) -> List[Dict[str, Any]]:
                     "path": str(file_path),
                     "row": line_num,
                     "col": col_num,
-                    "code": rule,
+                    "code": intern_code(rule),
                     "text": f"[{level}] {message}"
                 })
             except (ValueError, IndexError):
@@ -124,13 +125,15 @@ def parse_yamllint_output(output: str, file_path: Path) -> List[Dict[str, Any]]:
     
     return issues
 
-def run_yaml_linter(files: List[Path], repo_path: Path) -> Dict[str, List[Dict[str, Any]]]:
+def run_yaml_linter(files: List[Path], repo_path: Path, setup: bool = True) -> Dict[str, List[Dict[str, Any]]]:
     """
     Run YAML linter on a list of files.
     
     Args:
         files: List of YAML files to lint
         repo_path: Path to the repository
+        setup: Set up the linter environment first; pass False when a
+            caller has already prepared it
         
     Returns:
         Dictionary mapping file paths to lists of linting issues
@@ -138,7 +141,7 @@ def run_yaml_linter(files: List[Path], repo_path: Path) -> Dict[str, List[Dict[s
     all_issues = {}
     temp_path = get_yaml_temp_dir(repo_path)
     
-    if not setup_yaml_env(temp_path):
+    if setup and not setup_yaml_env(temp_path):
         logger.error("Failed to setup YAML environment")
         return all_issues
     
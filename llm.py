@@ -6,13 +6,32 @@ import subprocess
 import json
 import os
 import tempfile
+import functools
+import hashlib
+import importlib.util
+import shutil
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Callable, Iterable, Tuple, Union
 import logging
+import re
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from utils.memory_monitor import register_cache
 
 logger = logging.getLogger(__name__)
 
+# Headers an LLM commonly puts right before the corrected code
+_BLOCK_HEADERS = re.compile(r"CORRECTED CODE:|FIXED CODE:|HERE IS THE FIX:|SOLUTION:", re.IGNORECASE)
+
+# Substrings that suggest a line is code, across languages
+_CODE_PATTERN = re.compile("|".join(re.escape(pattern) for pattern in [
+    'import ', 'def ', 'class ', 'if __name__',  # Python
+    'function ', 'const ', 'let ', 'var ', 'export ',  # JavaScript/TypeScript
+    '<!DOCTYPE', '<html', '<head', '<body',  # HTML
+    '{', '}', ';', '/*', '*/'  # General code patterns
+]))
+
 # Default prompt template
 DEFAULT_PROMPT_TEMPLATE = """You are a programming assistant. Below is a source code snippet and its lint errors:
 
@@ -53,6 +72,27 @@ def load_prompt_template() -> str:
     logger.info("Using default prompt template (templates/fix_prompt.txt not found)")
     return DEFAULT_PROMPT_TEMPLATE
 
+@functools.lru_cache(maxsize=512)
+def _read_source_cached(path: str, mtime_ns: int, size: int) -> str:
+    """Read a source file; mtime and size are part of the cache key only."""
+    # Single binary read and decode avoids the text-IO layer for large files
+    return Path(path).read_bytes().decode("utf-8", errors="replace")
+
+register_cache(_read_source_cached)
+
+def _read_source(file_path: Path) -> str:
+    """
+    Read a source file, reusing the cached text while it is unchanged on disk.
+    
+    Args:
+        file_path: Path to the source file
+        
+    Returns:
+        File contents
+    """
+    stat = os.stat(file_path)
+    return _read_source_cached(str(file_path), stat.st_mtime_ns, stat.st_size)
+
 def build_prompt(file_path: Path, issues: List[Dict[str, Any]]) -> str:
     """
     Build a prompt for the LLM based on code and lint issues.
@@ -65,9 +105,8 @@ def build_prompt(file_path: Path, issues: List[Dict[str, Any]]) -> str:
         Formatted prompt string
     """
     try:
-        # Read the source code
-        with open(file_path, "r", encoding="utf-8") as f:
-            code = f.read()
+        # Read the source code (cached by path, mtime and size)
+        code = _read_source(file_path)
     except Exception as e:
         logger.error(f"Failed to read file {file_path}: {e}")
         return ""
@@ -150,51 +189,133 @@ def _format_issues_compressed(issues: List[Dict[str, Any]]) -> str:
                 return priority_order.get(prefix, 0)
             return 0
         
+        omitted = len(issues) - max_issues
         issues = sorted(issues, key=get_priority, reverse=True)[:max_issues]
-        issues.append({'code': '...', 'text': f'and {len(issues) - max_issues} more issues'})
+        issues.append({'code': '...', 'text': f'and {omitted} more issues'})
     
-    # Format issues
-    issues_text = ""
+    # Format issues (join once instead of repeated string concatenation)
+    parts = []
+    append = parts.append
     for issue in issues:
-        issues_text += f"Line {issue.get('row', '?')}, Column {issue.get('col', '?')}: {issue.get('code', 'unknown')} - {issue.get('text', '')}\n"
+        g = issue.get
+        append(f"Line {g('row', '?')}, Column {g('col', '?')}: {g('code', 'unknown')} - {g('text', '')}")
+    
+    return "\n".join(parts)
+
+def _cache_when_found(lookup: Callable[[], Any]) -> Callable[[], Any]:
+    """
+    Cache the first truthy result of a runner lookup.
+    
+    Misses are not cached, so a runner installed or started while the web
+    server is running is picked up on the next request.
+    """
+    found = None
+    
+    @functools.wraps(lookup)
+    def wrapper():
+        nonlocal found
+        if not found:
+            found = lookup()
+        return found
+    
+    def cache_clear():
+        nonlocal found
+        found = None
+    
+    wrapper.cache_clear = cache_clear
+    return wrapper
+
+@_cache_when_found
+def _find_llama_exe() -> Optional[str]:
+    """
+    Locate the llama.cpp executable, remembering it once found.
+    
+    Local builds are checked with a stat instead of running them, and
+    PATH-resident binaries are resolved with shutil.which.
+    
+    Returns:
+        Path to the executable or None if not found
+    """
+    for path in ("./llama.cpp/main", "./llama.cpp/build/bin/main"):
+        if os.path.isfile(path) and os.access(path, os.X_OK):
+            return path
+    
+    for name in ("llama-cpp-python", "llama"):
+        found = shutil.which(name)
+        if found:
+            return found
+    
+    return None
+
+@_cache_when_found
+def _ollama_available() -> bool:
+    """Check whether the ollama executable is on PATH, remembering it once found."""
+    return shutil.which("ollama") is not None
+
+def _env_number(name: str, default: float, cast: Callable[[str], float]) -> float:
+    """Read a positive number from the environment, falling back to default if unset or invalid."""
+    value = os.environ.get(name)
+    if not value:
+        return default
+    try:
+        number = cast(value)
+        if number <= 0:
+            raise ValueError("must be positive")
+        return number
+    except ValueError as e:
+        logger.warning(f"Ignoring invalid {name}={value!r} ({e}); using {default}")
+        return default
+
+def _llm_throughput() -> float:
+    """Expected LLM tokens per second (CODEFIXER_LLM_THROUGHPUT, default 80)."""
+    return _env_number('CODEFIXER_LLM_THROUGHPUT', 80.0, float)
+
+def _adaptive_timeout(prompt: str, min_timeout: int = 30, throughput: Optional[float] = None) -> int:
+    """
+    Estimate how long an LLM request for a prompt should be allowed to run.
+    
+    Assumes roughly 4 characters per token and allows twice the time the
+    expected throughput would need.
     
-    return issues_text
+    Args:
+        prompt: Input prompt
+        min_timeout: Lower bound in seconds
+        throughput: Expected tokens per second (defaults to
+            CODEFIXER_LLM_THROUGHPUT or 80)
+        
+    Returns:
+        Timeout in seconds
+    """
+    if throughput is None:
+        throughput = _llm_throughput()
+    tokens = len(prompt) // 4
+    return max(min_timeout, int(tokens / throughput * 2.0))
 
-def run_llama_cpp(prompt: str, model: str) -> Optional[str]:
+def run_llama_cpp(prompt: str, model: str, timeout: Optional[int] = None) -> Optional[str]:
     """
     Run inference with llama.cpp.
     
     Args:
         prompt: Input prompt
         model: Model name/path
+        timeout: Timeout in seconds (defaults to CODEFIXER_LLM_TIMEOUT or 60)
         
     Returns:
         Generated text or None if failed
+        
+    Raises:
+        subprocess.TimeoutExpired: If inference did not finish in time
     """
     try:
-        # Try to find llama.cpp executable
-        llama_paths = [
-            "./llama.cpp/main",
-            "./llama.cpp/build/bin/main",
-            "llama-cpp-python",
-            "llama"
-        ]
-        
-        llama_executable = None
-        for path in llama_paths:
-            try:
-                subprocess.run([path, "--help"], capture_output=True, check=True)
-                llama_executable = path
-                break
-            except (subprocess.CalledProcessError, FileNotFoundError):
-                continue
-        
+        # Find llama.cpp executable (cached after the first lookup)
+        llama_executable = _find_llama_exe()
         if not llama_executable:
             logger.error("llama.cpp executable not found")
             return None
         
         # Run inference with configurable timeout
-        timeout = int(os.environ.get('CODEFIXER_LLM_TIMEOUT', '60'))
+        if timeout is None:
+            timeout = _env_number('CODEFIXER_LLM_TIMEOUT', 60, int)
         result = subprocess.run([
             llama_executable,
             "-m", model,
@@ -211,33 +332,35 @@ def run_llama_cpp(prompt: str, model: str) -> Optional[str]:
         return result.stdout.strip()
         
     except subprocess.TimeoutExpired:
-        logger.error("llama.cpp inference timed out")
-        return None
+        raise
     except Exception as e:
         logger.error(f"llama.cpp error: {e}")
         return None
 
-def run_ollama(prompt: str, model: str) -> Optional[str]:
+def run_ollama(prompt: str, model: str, timeout: Optional[int] = None) -> Optional[str]:
     """
     Run inference with Ollama.
     
     Args:
         prompt: Input prompt
         model: Model name
+        timeout: Timeout in seconds (defaults to CODEFIXER_LLM_TIMEOUT or 60)
         
     Returns:
         Generated text or None if failed
+        
+    Raises:
+        subprocess.TimeoutExpired: If inference did not finish in time
     """
     try:
         # Check if Ollama is available
-        try:
-            subprocess.run(["ollama", "--version"], capture_output=True, check=True)
-        except (subprocess.CalledProcessError, FileNotFoundError):
+        if not _ollama_available():
             logger.error("Ollama not found")
             return None
         
         # Run inference with configurable timeout
-        timeout = int(os.environ.get('CODEFIXER_LLM_TIMEOUT', '60'))
+        if timeout is None:
+            timeout = _env_number('CODEFIXER_LLM_TIMEOUT', 60, int)
         result = subprocess.run([
             "ollama", "run", model, prompt
         ], capture_output=True, text=True, timeout=timeout)
@@ -249,88 +372,162 @@ def run_ollama(prompt: str, model: str) -> Optional[str]:
         return result.stdout.strip()
         
     except subprocess.TimeoutExpired:
-        logger.error("Ollama inference timed out")
-        # Retry once with a shorter timeout
-        try:
-            logger.info("Retrying with shorter timeout...")
-            timeout = int(os.environ.get('CODEFIXER_LLM_TIMEOUT', '60')) // 2
-            result = subprocess.run([
-                "ollama", "run", model, prompt
-            ], capture_output=True, text=True, timeout=timeout)
-            
-            if result.returncode == 0:
-                return result.stdout.strip()
-        except Exception:
-            pass
-        return None
+        raise
     except Exception as e:
         logger.error(f"Ollama error: {e}")
         return None
 
-def extract_code_from_response(response: str) -> str:
+def extract_code_from_response(response: str) -> Optional[str]:
     """
     Extract code from LLM response (language-agnostic).
     
+    The response is scanned once, tracking line index ranges instead of
+    copying lines. The last fenced code block wins; without fences, the
+    text after a "CORRECTED CODE:"-style header is used, and failing that,
+    everything from the first line that looks like code.
+    
     Args:
         response: Raw LLM response
         
     Returns:
-        Extracted code
+        Extracted code or None if nothing code-like was found
     """
     # Remove common prefixes/suffixes
     lines = response.strip().split('\n')
     
-    # Find code block markers
-    start_idx = 0
-    end_idx = len(lines)
+    in_block = False
+    block_start = None  # First line of the fenced block being read
+    last_block = None  # (start, end) of the last closed fenced block
+    header_end = None  # Line after a "CORRECTED CODE:"-style header
+    code_start = None  # First line that looks like code
     
     for i, line in enumerate(lines):
-        if line.strip().startswith('```'):
-            start_idx = i + 1
-            break
-        elif any(prefix in line.upper() for prefix in ['CORRECTED CODE:', 'FIXED CODE:', 'HERE IS THE FIX:', 'SOLUTION:']):
-            start_idx = i + 1
-            break
+        if line.lstrip().startswith('```'):
+            if in_block:
+                last_block = (block_start, i)
+            else:
+                block_start = i + 1
+            in_block = not in_block
+        elif block_start is None:
+            # Only needed while no code fence has been seen
+            if header_end is None and _BLOCK_HEADERS.search(line):
+                header_end = i + 1
+            if code_start is None and _CODE_PATTERN.search(line):
+                code_start = i
+    
+    if in_block:
+        # Unterminated fence (e.g. truncated output): take the rest
+        start, end = block_start, len(lines)
+    elif last_block:
+        start, end = last_block
+    elif header_end is not None:
+        start, end = header_end, len(lines)
+    elif code_start is not None:
+        start, end = code_start, len(lines)
+    else:
+        return None
     
-    for i in range(len(lines) - 1, -1, -1):
-        if lines[i].strip().startswith('```'):
-            end_idx = i
-            break
+    # Skip empty lines at start/end by moving the indices
+    while start < end and not lines[start].strip():
+        start += 1
+    while end > start and not lines[end - 1].strip():
+        end -= 1
     
-    # Extract code
-    code_lines = lines[start_idx:end_idx]
-    
-    # Remove empty lines at start/end
-    while code_lines and not code_lines[0].strip():
-        code_lines.pop(0)
-    while code_lines and not code_lines[-1].strip():
-        code_lines.pop()
-    
-    # If no code blocks found, try to extract from the entire response
-    if start_idx == 0 and end_idx == len(lines):
-        # Look for common code patterns across languages
-        code_lines = []
-        in_code = False
-        for line in lines:
-            # Check for various language patterns
-            if any(pattern in line for pattern in [
-                'import ', 'def ', 'class ', 'if __name__',  # Python
-                'function ', 'const ', 'let ', 'var ', 'export ',  # JavaScript/TypeScript
-                '<!DOCTYPE', '<html', '<head', '<body',  # HTML
-                '{', '}', ';', '/*', '*/'  # General code patterns
-            ]):
-                in_code = True
-            if in_code:
-                code_lines.append(line)
-    
-    result = '\n'.join(code_lines)
+    result = '\n'.join(lines[start:end])
     
     # Basic validation - ensure we have some code content
-    if not result.strip() or len(result.strip()) < 10:
+    if len(result.strip()) < 10:
         return None
     
     return result
 
+def _fix_cache_dir() -> Optional[Path]:
+    """
+    Get the directory of the persistent fix cache.
+    
+    Set CODEFIXER_FIX_CACHE=0 to disable the cache, or CODEFIXER_FIX_CACHE_DIR
+    to move it. CODEFIXER_FIX_CACHE_MAX_MB bounds its size (default 512).
+    
+    Returns:
+        Cache directory or None if caching is disabled
+    """
+    if os.environ.get('CODEFIXER_FIX_CACHE', '1') == '0':
+        return None
+    cache_dir = os.environ.get('CODEFIXER_FIX_CACHE_DIR')
+    if cache_dir:
+        return Path(cache_dir)
+    return Path.home() / ".cache" / "codefixer" / "fixes"
+
+def _fix_cache_key(prompt: str, model: str, runner: str) -> str:
+    """
+    Build the fix cache key from the prompt sent to the LLM, the model and the runner.
+    
+    The prompt already holds the code, the issues and the template, so editing
+    templates/fix_prompt.txt or switching runners cannot serve a stale fix.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(prompt.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(model.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(runner.lower().encode("utf-8"))
+    return digest.hexdigest()
+
+def _fix_cache_get(key: str) -> Optional[str]:
+    """Look up a previously generated fix."""
+    cache_dir = _fix_cache_dir()
+    if cache_dir is None:
+        return None
+    path = cache_dir / f"{key}.txt"
+    try:
+        fixed_code = path.read_bytes().decode("utf-8")
+        # Eviction goes by mtime, so mark the entry as recently used
+        os.utime(path)
+        return fixed_code
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.debug(f"Failed to read fix cache entry {key}: {e}")
+        return None
+
+def _fix_cache_set(key: str, fixed_code: str) -> None:
+    """Store a generated fix (written atomically so concurrent readers never see partial files)."""
+    cache_dir = _fix_cache_dir()
+    if cache_dir is None:
+        return
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=cache_dir, suffix=".tmp", delete=False) as f:
+            f.write(fixed_code.encode("utf-8"))
+        os.replace(f.name, cache_dir / f"{key}.txt")
+        _evict_fix_cache(cache_dir, _env_number('CODEFIXER_FIX_CACHE_MAX_MB', 512, float) * 1024 * 1024)
+    except Exception as e:
+        logger.debug(f"Failed to write fix cache entry {key}: {e}")
+
+def _evict_fix_cache(cache_dir: Path, max_bytes: float) -> None:
+    """Delete the least recently used fix cache entries until the cache fits in max_bytes."""
+    entries = []
+    total = 0
+    with os.scandir(cache_dir) as it:
+        for entry in it:
+            if entry.name.endswith(".txt") and entry.is_file(follow_symlinks=False):
+                st = entry.stat(follow_symlinks=False)
+                entries.append((st.st_mtime_ns, st.st_size, entry.path))
+                total += st.st_size
+    
+    if total <= max_bytes:
+        return
+    
+    entries.sort()
+    for _, size, path in entries:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        if total <= max_bytes:
+            break
+
 def generate_fix(file_path: Path, issues: List[Dict[str, Any]], model: str = 'gemma3:1b', runner: str = 'ollama', timeout: int = 30, max_retries: int = 3) -> Optional[str]:
     """
     Generate a fix for lint issues using local LLM.
@@ -340,12 +537,27 @@ def generate_fix(file_path: Path, issues: List[Dict[str, Any]], model: str = 'ge
         issues: List of linting issues
         model: LLM model to use
         runner: LLM runner ('ollama' or 'llama.cpp')
-        timeout: Request timeout in seconds
+        timeout: Minimum request timeout in seconds, raised to CODEFIXER_LLM_TIMEOUT
+            (default 60) if that is larger; longer prompts get more
         max_retries: Maximum number of retries
         
     Returns:
         Fixed code or None if failed
     """
+    if not issues:
+        logger.debug(f"No issues to fix in {file_path}")
+        return None
+    
+    # Several linters often flag the same spot; keep one issue per location and code
+    seen = set()
+    unique_issues = []
+    for issue in issues:
+        key = (issue.get('row'), issue.get('col'), issue.get('code'))
+        if key not in seen:
+            seen.add(key)
+            unique_issues.append(issue)
+    issues = unique_issues
+    
     logger.debug(f"Generating fix for {file_path} with {len(issues)} issues")
     
     # Build prompt
@@ -353,16 +565,44 @@ def generate_fix(file_path: Path, issues: List[Dict[str, Any]], model: str = 'ge
     if not prompt:
         return None
     
+    # Reuse a fix generated earlier for the same prompt, model and runner
+    try:
+        original_code = _read_source(file_path)
+        cache_key = _fix_cache_key(prompt, model, runner)
+    except Exception as e:
+        logger.debug(f"Fix cache unavailable for {file_path}: {e}")
+        original_code = cache_key = None
+    
+    if cache_key:
+        cached_fix = _fix_cache_get(cache_key)
+        if cached_fix:
+            logger.debug(f"Using cached fix for {file_path}")
+            return cached_fix
+    
+    # Expected tokens/s, used to scale the timeout with the prompt size
+    throughput = _llm_throughput()
+    
+    # The runners' CODEFIXER_LLM_TIMEOUT (default 60s) stays the floor
+    env_timeout = _env_number('CODEFIXER_LLM_TIMEOUT', 60, int)
+    try:
+        min_timeout = max(int(timeout), env_timeout)
+    except (TypeError, ValueError):
+        logger.warning(f"Invalid timeout {timeout!r}; using {env_timeout}s")
+        min_timeout = env_timeout
+    request_timeout = min_timeout
+    
     for attempt in range(max_retries):
         try:
+            request_timeout = _adaptive_timeout(prompt, min_timeout, throughput)
+            
             logger.debug(f"LLM request attempt {attempt + 1}/{max_retries}")
             
             # Run LLM inference
             response = None
             if runner.lower() == "llama.cpp":
-                response = run_llama_cpp(prompt, model)
+                response = run_llama_cpp(prompt, model, request_timeout)
             elif runner.lower() == "ollama":
-                response = run_ollama(prompt, model)
+                response = run_ollama(prompt, model, request_timeout)
             else:
                 logger.error(f"Unknown LLM runner: {runner}")
                 return None
@@ -373,6 +613,8 @@ def generate_fix(file_path: Path, issues: List[Dict[str, Any]], model: str = 'ge
                 
                 if fixed_code and fixed_code != "":
                     logger.debug(f"Generated fix successfully on attempt {attempt + 1}")
+                    if cache_key and validate_fix(original_code, fixed_code):
+                        _fix_cache_set(cache_key, fixed_code)
                     return fixed_code
                 else:
                     logger.warning(f"LLM returned empty or unchanged code on attempt {attempt + 1}")
@@ -380,7 +622,9 @@ def generate_fix(file_path: Path, issues: List[Dict[str, Any]], model: str = 'ge
                 logger.warning(f"LLM request failed on attempt {attempt + 1}")
                 
         except subprocess.TimeoutExpired:
-            logger.warning(f"LLM request timed out on attempt {attempt + 1} (timeout: {timeout}s)")
+            logger.warning(f"LLM request timed out on attempt {attempt + 1} (timeout: {request_timeout}s)")
+            # The model is slower than expected; give the next attempt more time
+            throughput /= 2
         except Exception as e:
             logger.warning(f"LLM request error on attempt {attempt + 1}: {e}")
         
@@ -393,6 +637,56 @@ def generate_fix(file_path: Path, issues: List[Dict[str, Any]], model: str = 'ge
     logger.error(f"Failed to generate fix after {max_retries} attempts")
     return None
 
+def generate_fixes(jobs: Iterable[Tuple[Union[str, Path], List[Dict[str, Any]]]], model: str = 'gemma3:1b', runner: str = 'ollama', timeout: int = 30, max_retries: int = 3, max_workers: Optional[int] = None, progress: Optional[Callable[[], Any]] = None) -> Dict[str, str]:
+    """
+    Generate fixes for several files concurrently.
+    
+    LLM calls spend their time waiting on the runner process or server, so
+    a thread pool keeps several requests in flight at once.
+    
+    Args:
+        jobs: Iterable of (file path, issues) pairs
+        model: LLM model to use
+        runner: LLM runner ('ollama' or 'llama.cpp')
+        timeout: Request timeout in seconds
+        max_retries: Maximum number of retries per file
+        max_workers: Number of concurrent requests (defaults to CODEFIXER_LLM_PARALLEL or 4)
+        progress: Optional callback invoked once per finished file
+        
+    Returns:
+        Dictionary mapping file paths (as given) to fixed code
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return {}
+    
+    if max_workers is None:
+        max_workers = _env_number('CODEFIXER_LLM_PARALLEL', 4, int)
+    max_workers = max(1, min(len(jobs), max_workers))
+    
+    fixes = {}
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Submit one fix request per file
+        future_to_path = {
+            executor.submit(generate_fix, Path(file_path), issues, model, runner, timeout, max_retries): str(file_path)
+            for file_path, issues in jobs
+        }
+        
+        # Collect results
+        for future in as_completed(future_to_path):
+            file_path = future_to_path[future]
+            try:
+                fix = future.result()
+                if fix:
+                    fixes[file_path] = fix
+            except Exception as e:
+                logger.error(f"Error generating fix for {file_path}: {e}")
+            if progress:
+                progress()
+    
+    return fixes
+
 def validate_fix(original_code: str, fixed_code: str) -> bool:
     """
     Basic validation of generated fix.
@@ -409,11 +703,11 @@ def validate_fix(original_code: str, fixed_code: str) -> bool:
         return False
     
     # Check if the fix is too different (might be hallucination)
-    original_lines = original_code.split('\n')
-    fixed_lines = fixed_code.split('\n')
+    original_lines = original_code.count('\n') + 1
+    fixed_lines = fixed_code.count('\n') + 1
     
     # If the number of lines is very different, be suspicious
-    if abs(len(original_lines) - len(fixed_lines)) > len(original_lines) * 0.5:
+    if abs(original_lines - fixed_lines) > original_lines * 0.5:
         logger.warning("Generated fix has very different line count")
         return False
     
@@ -422,27 +716,16 @@ def validate_fix(original_code: str, fixed_code: str) -> bool:
 def detect_llm_runner() -> str:
     """Auto-detect available LLM runner."""
     # Check for Ollama
-    try:
-        result = subprocess.run(['ollama', '--version'], capture_output=True, text=True)
-        if result.returncode == 0:
-            return 'ollama'
-    except FileNotFoundError:
-        pass
+    if _ollama_available():
+        return 'ollama'
     
     # Check for llama.cpp
-    try:
-        result = subprocess.run(['llama-cpp-python', '--version'], capture_output=True, text=True)
-        if result.returncode == 0:
-            return 'llama.cpp'
-    except FileNotFoundError:
-        pass
+    if _find_llama_exe():
+        return 'llama.cpp'
     
-    # Check for vLLM
-    try:
-        import vllm
+    # Check for vLLM (find_spec avoids importing torch just to detect it)
+    if importlib.util.find_spec('vllm') is not None:
         return 'vllm'
-    except ImportError:
-        pass
     
     # Check for LM Studio
     try:
@@ -453,11 +736,8 @@ def detect_llm_runner() -> str:
         pass
     
     # Check for local Hugging Face models
-    try:
-        import transformers
+    if importlib.util.find_spec('transformers') is not None:
         return 'huggingface'
-    except ImportError:
-        pass
     
     return 'unknown'
 
@@ -486,6 +766,9 @@ def generate_fix_vllm(file_path: Path, issues: List[Dict[str, Any]], model: str,
         
         return extract_code_from_response(response)
         
+    except ImportError:
+        logger.error("vLLM is not installed; install it with: pip install 'codefixer-cli[llm]'")
+        return None
     except Exception as e:
         logger.error(f"vLLM generation failed: {e}")
         return None
@@ -560,6 +843,9 @@ def generate_fix_huggingface(file_path: Path, issues: List[Dict[str, Any]], mode
         
         return extract_code_from_response(response)
         
+    except ImportError:
+        logger.error("transformers/torch are not installed; install them with: pip install 'codefixer-cli[llm]'")
+        return None
     except Exception as e:
         logger.error(f"Hugging Face generation failed: {e}")
         return None
@@ -631,8 +917,11 @@ def list_llamacpp_models() -> List[str]:
         models = set()
         for model_dir in model_dirs:
             if model_dir.exists():
-                for model_file in model_dir.glob("*.gguf"):
-                    models.add(model_file.stem)
+                # scandir avoids building a Path object for every entry
+                with os.scandir(model_dir) as entries:
+                    for entry in entries:
+                        if entry.name.endswith(".gguf") and entry.is_file():
+                            models.add(entry.name[:-len(".gguf")])
         
         return list(models)
     except Exception as e:
@@ -3,10 +3,25 @@ Logging module for CodeFixer.
 """
 
 import logging
+import os
 import sys
 from pathlib import Path
 from typing import Optional
 
+# Shared formatter for all handlers created by setup_logger
+_FORMATTER = logging.Formatter(
+    '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S',
+    validate=False
+)
+
+def _enable_fast_logging() -> None:
+    """Skip per-record thread/process lookups and caller frame walks."""
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    logging._srcfile = None
+
 def setup_logger(name: str = "codefixer", level: str = "INFO", log_file: Optional[str] = None) -> logging.Logger:
     """
     Set up logging for CodeFixer.
@@ -19,23 +34,23 @@ def setup_logger(name: str = "codefixer", level: str = "INFO", log_file: Optiona
     Returns:
         Configured logger
     """
+    # Records never use thread/process names or caller info in our format,
+    # so worker processes can opt out of collecting them
+    if os.environ.get('CODEFIXER_FAST_LOG'):
+        _enable_fast_logging()
+    
     # Create logger
+    log_level = getattr(logging, level.upper())
     logger = logging.getLogger(name)
-    logger.setLevel(getattr(logging, level.upper()))
+    logger.setLevel(log_level)
     
     # Clear existing handlers
     logger.handlers.clear()
     
-    # Create formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(getattr(logging, level.upper()))
-    console_handler.setFormatter(formatter)
+    console_handler.setLevel(log_level)
+    console_handler.setFormatter(_FORMATTER)
     logger.addHandler(console_handler)
     
     # File handler (if specified)
@@ -43,7 +58,7 @@ def setup_logger(name: str = "codefixer", level: str = "INFO", log_file: Optiona
         try:
             file_handler = logging.FileHandler(log_file)
             file_handler.setLevel(logging.DEBUG)  # Always log everything to file
-            file_handler.setFormatter(formatter)
+            file_handler.setFormatter(_FORMATTER)
             logger.addHandler(file_handler)
         except Exception as e:
             logger.warning(f"Failed to setup file logging: {e}")
@@ -3,13 +3,77 @@ Parallel linter execution for CodeFixer.
 Runs multiple linters concurrently for better performance.
 """
 
+import functools
+import heapq
 import multiprocessing as mp
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Any, Callable
+from typing import Dict, List, Any, Callable, Tuple
 import logging
 
+from linters.python_linter import run_python_linter, get_python_temp_dir, setup_python_env
+from linters.js_linter import run_js_linter, get_js_temp_dir, setup_js_env
+from linters.html_linter import run_html_linter, get_html_temp_dir, setup_html_env
+from linters.css_linter import run_css_linter, get_css_temp_dir, setup_css_env
+from linters.yaml_linter import run_yaml_linter, get_yaml_temp_dir, setup_yaml_env
+
 logger = logging.getLogger(__name__)
 
+# Linter function for each language; JS linter handles both JS and TS
+LINTER_MAPPINGS: Dict[str, Callable] = {
+    'python': run_python_linter,
+    'javascript': run_js_linter,
+    'typescript': run_js_linter,
+    'html': run_html_linter,
+    'css': run_css_linter,
+    'yaml': run_yaml_linter
+}
+
+# Environment directory and setup function behind each linter. Every chunk
+# of a language shares one per-repo environment, so it is prepared once in
+# the parent and the workers skip setup instead of racing to install into it.
+LINTER_ENV_SETUP: Dict[Callable, Tuple[Callable, Callable]] = {
+    run_python_linter: (get_python_temp_dir, setup_python_env),
+    run_js_linter: (get_js_temp_dir, setup_js_env),
+    run_html_linter: (get_html_temp_dir, setup_html_env),
+    run_css_linter: (get_css_temp_dir, setup_css_env),
+    run_yaml_linter: (get_yaml_temp_dir, setup_yaml_env),
+}
+
+# Never start more worker processes than this
+MAX_PROCESSES = 8
+
+# Languages with fewer files than this per extra process are not split
+MIN_CHUNK_FILES = 8
+
+@functools.lru_cache(maxsize=1)
+def _mp_context() -> mp.context.BaseContext:
+    """
+    Multiprocessing context for the linter pools.
+    
+    On Linux this is a forkserver that preloads this module, so workers start
+    with the linters already imported; forkserver is cheaper than spawn and
+    safer than fork from a process that may be running threads.
+    """
+    if sys.platform.startswith('linux'):
+        ctx = mp.get_context('forkserver')
+        ctx.set_forkserver_preload([__name__])
+        return ctx
+    return mp.get_context()
+
+def _num_chunks(num_files: int) -> int:
+    """Number of chunks to split a language's files into."""
+    return max(1, min(mp.cpu_count(), MAX_PROCESSES, num_files // MIN_CHUNK_FILES))
+
+def _prepare_env(linter_func: Callable, repo_path: Path) -> bool:
+    """Set up a linter's environment once before its files are fanned out."""
+    get_temp_dir, setup_env = LINTER_ENV_SETUP[linter_func]
+    if setup_env(get_temp_dir(repo_path)):
+        return True
+    logger.error(f"Failed to set up environment for {linter_func.__name__}")
+    return False
+
 def run_linter_parallel(linter_func: Callable, files: List[Path], repo_path: Path) -> Dict[str, List[Dict[str, Any]]]:
     """
     Run a linter function in parallel for multiple files.
@@ -26,25 +90,23 @@ def run_linter_parallel(linter_func: Callable, files: List[Path], repo_path: Pat
         return {}
     
     # Determine optimal number of processes
-    num_processes = min(mp.cpu_count(), len(files), 8)  # Cap at 8 processes
+    num_processes = _num_chunks(len(files))
     
-    if len(files) <= 1 or num_processes <= 1:
+    if num_processes <= 1:
         # Run sequentially for small workloads
         return linter_func(files, repo_path)
     
+    if not _prepare_env(linter_func, repo_path):
+        return {}
+    
     # Split files into chunks for parallel processing
-    chunk_size = max(1, len(files) // num_processes)
-    file_chunks = [files[i:i + chunk_size] for i in range(0, len(files), chunk_size)]
+    file_chunks = _split_files(files, num_processes)
     
     logger.info(f"Running {linter_func.__name__} in parallel with {num_processes} processes on {len(files)} files")
     
-    # Use ProcessPoolExecutor for better resource management
-    from concurrent.futures import ProcessPoolExecutor, as_completed
-    import functools
-    
     all_issues = {}
     
-    with ProcessPoolExecutor(max_workers=num_processes) as executor:
+    with ProcessPoolExecutor(max_workers=num_processes, mp_context=_mp_context()) as executor:
         # Submit tasks
         future_to_chunk = {
             executor.submit(_run_linter_chunk, linter_func, chunk, repo_path): chunk 
@@ -62,7 +124,7 @@ def run_linter_parallel(linter_func: Callable, files: List[Path], repo_path: Pat
                 logger.error(f"Error processing chunk {chunk}: {e}")
                 # Fallback to sequential processing for this chunk
                 try:
-                    fallback_issues = linter_func(chunk, repo_path)
+                    fallback_issues = linter_func(chunk, repo_path, setup=False)
                     if fallback_issues:
                         all_issues.update(fallback_issues)
                 except Exception as fallback_error:
@@ -70,10 +132,48 @@ def run_linter_parallel(linter_func: Callable, files: List[Path], repo_path: Pat
     
     return all_issues
 
+def _file_size(file_path: Path) -> int:
+    """Return the size of a file in bytes, or 0 if it cannot be read."""
+    try:
+        return file_path.stat().st_size
+    except OSError:
+        return 0
+
+def _split_files(files: List[Path], num_chunks: int) -> List[List[Path]]:
+    """
+    Split files into chunks of roughly equal total size for parallel workers.
+    
+    Files are assigned largest first to the currently lightest chunk
+    (longest-processing-time scheduling), so one worker does not end up
+    with all the big files.
+    
+    Args:
+        files: List of files to split
+        num_chunks: Target number of chunks
+        
+    Returns:
+        List of non-empty file chunks
+    """
+    num_chunks = max(1, min(num_chunks, len(files)))
+    chunks = [[] for _ in range(num_chunks)]
+    # (total size, file count, chunk index); the count breaks ties so empty
+    # or unreadable files are still spread across chunks
+    heap = [(0, 0, idx) for idx in range(num_chunks)]
+    
+    sized_files = sorted(((_file_size(f), f) for f in files), key=lambda item: item[0], reverse=True)
+    for size, file_path in sized_files:
+        total, count, idx = heapq.heappop(heap)
+        chunks[idx].append(file_path)
+        heapq.heappush(heap, (total + size, count + 1, idx))
+    
+    return [chunk for chunk in chunks if chunk]
+
 def _run_linter_chunk(linter_func: Callable, files: List[Path], repo_path: Path) -> Dict[str, List[Dict[str, Any]]]:
     """
     Run linter on a chunk of files (worker function for multiprocessing).
     
+    The linter's environment must already have been prepared by the parent.
+    
     Args:
         linter_func: Function to run
         files: List of files to lint
@@ -83,7 +183,7 @@ def _run_linter_chunk(linter_func: Callable, files: List[Path], repo_path: Path)
         Dictionary mapping file paths to lists of linting issues
     """
     try:
-        return linter_func(files, repo_path)
+        return linter_func(files, repo_path, setup=False)
     except Exception as e:
         logger.error(f"Error in linter chunk: {e}")
         return {}
@@ -101,23 +201,6 @@ def run_linters_parallel(languages: Dict[str, List[Path]], repo_path: Path) -> D
     """
     all_issues = {}
     
-    # Import linter functions
-    from linters.python_linter import run_python_linter
-    from linters.js_linter import run_js_linter
-    from linters.html_linter import run_html_linter
-    from linters.css_linter import run_css_linter
-    from linters.yaml_linter import run_yaml_linter
-    
-    # Define linter mappings
-    linter_mappings = {
-        'python': run_python_linter,
-        'javascript': run_js_linter,
-        'typescript': run_js_linter,  # JS linter handles both
-        'html': run_html_linter,
-        'css': run_css_linter,
-        'yaml': run_yaml_linter
-    }
-    
     # Group JS/TS files together
     js_files = []
     ts_files = []
@@ -131,43 +214,63 @@ def run_linters_parallel(languages: Dict[str, List[Path]], repo_path: Path) -> D
         else:
             other_languages[lang] = files
     
-    # Use ThreadPoolExecutor for language-level parallelism
-    from concurrent.futures import ThreadPoolExecutor, as_completed
+    linter_files = []
+    if js_files or ts_files:
+        linter_files.append((run_js_linter, js_files + ts_files))
     
-    # Determine optimal number of threads for language-level parallelism
-    num_languages = len(other_languages) + (1 if js_files or ts_files else 0)
-    num_threads = min(num_languages, mp.cpu_count(), 4)  # Cap at 4 threads for language parallelism
+    for lang, files in other_languages.items():
+        linter = LINTER_MAPPINGS.get(lang)
+        if linter is None:
+            logger.warning(f"No linter configured for {lang}")
+            continue
+        linter_files.append((linter, files))
     
-    logger.info(f"Running linters in parallel with {num_threads} threads for {num_languages} languages")
+    if not linter_files:
+        return all_issues
     
-    with ThreadPoolExecutor(max_workers=num_threads) as executor:
-        # Submit language linter tasks
-        future_to_lang = {}
-        
-        # Submit JS/TS linter task
-        if js_files or ts_files:
-            all_js_ts_files = js_files + ts_files
-            future = executor.submit(run_linter_parallel, run_js_linter, all_js_ts_files, repo_path)
-            future_to_lang[future] = "javascript/typescript"
-        
-        # Submit other language linter tasks
-        for lang, files in other_languages.items():
-            if lang in linter_mappings:
-                future = executor.submit(run_linter_parallel, linter_mappings[lang], files, repo_path)
-                future_to_lang[future] = lang
-            else:
-                logger.warning(f"No linter configured for {lang}")
+    if len(linter_files) == 1 and _num_chunks(len(linter_files[0][1])) == 1:
+        # A single small language gains nothing from a process pool
+        linter_func, files = linter_files[0]
+        return linter_func(files, repo_path)
+    
+    # Flatten every language into (linter, chunk) work items so a single
+    # process pool serves all of them instead of nesting a pool per language.
+    # Small languages stay in one chunk.
+    work_items = []
+    for linter_func, files in linter_files:
+        if not _prepare_env(linter_func, repo_path):
+            continue
+        work_items.extend((linter_func, chunk) for chunk in _split_files(files, _num_chunks(len(files))))
+    
+    if not work_items:
+        return all_issues
+    
+    num_processes = min(mp.cpu_count(), MAX_PROCESSES, len(work_items))
+    
+    logger.info(f"Running linters in parallel with {num_processes} processes for {len(work_items)} work items")
+    
+    with ProcessPoolExecutor(max_workers=num_processes, mp_context=_mp_context()) as executor:
+        future_to_item = {
+            executor.submit(_run_linter_chunk, linter_func, chunk, repo_path): (linter_func, chunk)
+            for linter_func, chunk in work_items
+        }
         
         # Collect results
-        for future in as_completed(future_to_lang):
-            lang = future_to_lang[future]
+        for future in as_completed(future_to_item):
+            linter_func, chunk = future_to_item[future]
             try:
                 issues = future.result()
                 if issues:
                     all_issues.update(issues)
-                    logger.info(f"Completed {lang} linting with {len(issues)} files")
             except Exception as e:
-                logger.error(f"Error in {lang} linter: {e}")
+                logger.error(f"Error in {linter_func.__name__} on chunk {chunk}: {e}")
+                # Fallback to sequential processing for this chunk
+                try:
+                    fallback_issues = linter_func(chunk, repo_path, setup=False)
+                    if fallback_issues:
+                        all_issues.update(fallback_issues)
+                except Exception as fallback_error:
+                    logger.error(f"Fallback processing also failed: {fallback_error}")
     
     return all_issues
 
@@ -184,13 +287,6 @@ def run_linters_sequential(languages: Dict[str, List[Path]], repo_path: Path) ->
     """
     all_issues = {}
     
-    # Import linter functions
-    from linters.python_linter import run_python_linter
-    from linters.js_linter import run_js_linter
-    from linters.html_linter import run_html_linter
-    from linters.css_linter import run_css_linter
-    from linters.yaml_linter import run_yaml_linter
-    
     # Group JS/TS files together
     js_files = []
     ts_files = []
@@ -214,19 +310,13 @@ def run_linters_sequential(languages: Dict[str, List[Path]], repo_path: Path) ->
     
     # Run other language linters
     for lang, files in other_languages.items():
-        logger.info(f"Linting {lang} files...")
-        if lang == 'python':
-            issues = run_python_linter(files, repo_path)
-        elif lang == 'html':
-            issues = run_html_linter(files, repo_path)
-        elif lang == 'css':
-            issues = run_css_linter(files, repo_path)
-        elif lang == 'yaml':
-            issues = run_yaml_linter(files, repo_path)
-        else:
+        linter = LINTER_MAPPINGS.get(lang)
+        if linter is None:
             logger.warning(f"No linter configured for {lang}")
             continue
         
+        logger.info(f"Linting {lang} files...")
+        issues = linter(files, repo_path)
         if issues:
             all_issues.update(issues)
     
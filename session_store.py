@@ -0,0 +1,199 @@
+"""
+Session storage for the CodeFixer web interface.
+Sessions live on disk so every server worker sees the same data, and expire
+after SESSION_TTL seconds without a write.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import stat
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# orjson is optional and serialises large issue lists faster. Non-string
+# keys are stringified as json.dumps does, and path objects become strings.
+# The web interface uses the same pair for its on-disk caches.
+try:
+    import orjson
+    loads_json = orjson.loads
+    
+    def dumps_json(data: Any) -> bytes:
+        return orjson.dumps(data, default=os.fspath, option=orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    loads_json = json.loads
+    
+    def dumps_json(data: Any) -> bytes:
+        return json.dumps(data, default=os.fspath).encode("utf-8")
+
+# Seconds after the last write before a session expires
+SESSION_TTL = 3600
+
+# Prefix of the upload directories created by create_upload_dir
+UPLOAD_DIR_PREFIX = "cf_"
+
+def _session_dir() -> Path:
+    """
+    Return the session directory, creating it private to the current user.
+    
+    Defaults to a per-user directory under the system temp dir; override with
+    CODEFIXER_SESSION_DIR. A directory owned by someone else, or writable by
+    group or others, is refused so nobody else can plant sessions in it.
+    
+    Raises:
+        PermissionError: If the directory is not private to the current user
+    """
+    session_dir = os.environ.get('CODEFIXER_SESSION_DIR')
+    if session_dir:
+        path = Path(session_dir)
+    elif hasattr(os, 'getuid'):
+        path = Path(tempfile.gettempdir()) / f"codefixer-sessions-{os.getuid()}"
+    else:
+        path = Path(tempfile.gettempdir()) / "codefixer-sessions"
+    
+    path.mkdir(mode=0o700, parents=True, exist_ok=True)
+    if hasattr(os, 'getuid'):
+        st = os.lstat(path)
+        if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o022:
+            raise PermissionError(f"Refusing to use session directory {path}: not a private directory owned by this user")
+    return path
+
+def create_upload_dir(label: str) -> str:
+    """
+    Create a private directory for an uploaded repository.
+    
+    Args:
+        label: Filesystem-safe text to include in the directory name
+    
+    Returns:
+        Path of the new directory
+    """
+    return tempfile.mkdtemp(prefix=f"{UPLOAD_DIR_PREFIX}{label}_")
+
+def is_upload_dir(path: str) -> bool:
+    """Check that a path is an upload directory this user created with create_upload_dir."""
+    real = os.path.realpath(path)
+    if os.path.dirname(real) != os.path.realpath(tempfile.gettempdir()):
+        return False
+    if not os.path.basename(real).startswith(UPLOAD_DIR_PREFIX):
+        return False
+    try:
+        st = os.lstat(real)
+    except OSError:
+        return False
+    if not stat.S_ISDIR(st.st_mode):
+        return False
+    return not hasattr(os, 'getuid') or st.st_uid == os.getuid()
+
+def _paths_are_safe(data: Any) -> bool:
+    """Check that a session's temp_dir and repo_path point into an upload directory."""
+    if not isinstance(data, dict):
+        return False
+    temp_dir = data.get('temp_dir')
+    repo_path = data.get('repo_path')
+    if temp_dir is None:
+        return repo_path is None
+    if not is_upload_dir(temp_dir):
+        return False
+    if repo_path is None:
+        return True
+    root = os.path.realpath(temp_dir)
+    real = os.path.realpath(repo_path)
+    return real == root or real.startswith(root + os.sep)
+
+def _session_file(session_id: str) -> Path:
+    """Map a client-supplied session id to a file name that cannot escape the directory."""
+    digest = hashlib.blake2b(session_id.encode("utf-8"), digest_size=16).hexdigest()
+    return _session_dir() / f"{digest}.json"
+
+def _is_expired(path: Path, now: float) -> bool:
+    """Check whether a session file is older than SESSION_TTL."""
+    return now - path.stat().st_mtime > SESSION_TTL
+
+def get_session(session_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Load a session.
+    
+    Args:
+        session_id: Client-supplied session id
+    
+    Returns:
+        Session data, or None if the session does not exist, has expired, or
+        points outside the upload directories
+    """
+    path = _session_file(session_id)
+    try:
+        if _is_expired(path, time.time()):
+            return None
+        data = loads_json(path.read_bytes())
+        if not _paths_are_safe(data):
+            logger.warning(f"Ignoring session {session_id}: paths are outside the upload directories")
+            return None
+        return data
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Failed to read session {session_id}: {e}")
+        return None
+
+def set_session(session_id: str, data: Dict[str, Any]) -> None:
+    """
+    Store a session, written atomically so concurrent readers never see partial files.
+    
+    Args:
+        session_id: Client-supplied session id
+        data: JSON-serialisable session data; Path values are stored as strings
+    """
+    path = _session_file(session_id)
+    with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as f:
+        f.write(dumps_json(data))
+    os.replace(f.name, path)
+
+def delete_session(session_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Remove a session.
+    
+    Args:
+        session_id: Client-supplied session id
+    
+    Returns:
+        The removed session data, or None if there was none
+    """
+    data = get_session(session_id)
+    try:
+        _session_file(session_id).unlink()
+    except FileNotFoundError:
+        pass
+    return data
+
+def purge_expired_sessions() -> int:
+    """
+    Delete expired sessions together with their extracted repositories.
+    
+    Returns:
+        Number of sessions removed
+    """
+    session_dir = _session_dir()
+    now = time.time()
+    removed = 0
+    for path in session_dir.glob("*.json"):
+        try:
+            if not _is_expired(path, now):
+                continue
+            data = loads_json(path.read_bytes())
+            path.unlink()
+        except Exception as e:
+            logger.debug(f"Failed to purge session file {path}: {e}")
+            continue
+        
+        if _paths_are_safe(data) and data.get('temp_dir'):
+            shutil.rmtree(data['temp_dir'], ignore_errors=True)
+        removed += 1
+    
+    return removed
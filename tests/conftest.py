@@ -3,21 +3,27 @@ Pytest configuration and common fixtures for CodeFixer tests.
 """
 
 import pytest
-import tempfile
 import shutil
+import sys
+import tempfile
 from pathlib import Path
+from types import MappingProxyType
 from typing import Dict, List, Any
-import subprocess
 import os
 
-@pytest.fixture
-def temp_repo():
-    """Create a temporary git repository for testing."""
-    temp_dir = tempfile.mkdtemp()
-    repo_path = Path(temp_dir)
-    
-    # Initialize git repository
-    subprocess.run(["git", "init"], cwd=repo_path, check=True)
+def pytest_configure(config):
+    """Put test temp directories on tmpfs when available."""
+    # This must run before tmp_path_factory picks its base directory, which
+    # is why it is a hook rather than a session fixture. An explicit TMPDIR
+    # from the user still wins.
+    if sys.platform == "linux" and "TMPDIR" not in os.environ and os.access("/dev/shm", os.W_OK):
+        os.environ["TMPDIR"] = "/dev/shm"
+        tempfile.tempdir = None
+
+@pytest.fixture(scope="session")
+def _seed_files(tmp_path_factory):
+    """Write the source files shared by temp_files once per session."""
+    repo_path = tmp_path_factory.mktemp("seed")
     
     # Create some test files
     (repo_path / "test_file.py").write_text("""
@@ -42,12 +48,60 @@ function testFunction() {
 }
 """)
     
-    yield repo_path
+    return repo_path
+
+@pytest.fixture
+def temp_files(tmp_path, _seed_files):
+    """
+    Create a temporary directory with some source files for testing.
     
-    # Cleanup
-    shutil.rmtree(temp_dir)
+    The seed files are hardlinked, so tests that change one must replace it
+    (unlink, then write) rather than writing to it in place.
+    """
+    repo_path = tmp_path / "repo"
+    shutil.copytree(_seed_files, repo_path, copy_function=os.link)
+    return repo_path
+
+@pytest.fixture(scope="session")
+def _seed_repo(tmp_path_factory, _seed_files):
+    """Build the seed git repository shared by temp_repo once per session."""
+    repo_path = tmp_path_factory.mktemp("seed_repo") / "repo"
+    shutil.copytree(_seed_files, repo_path, copy_function=os.link)
+    
+    # Write the minimal layout git recognises instead of running `git init`
+    git_dir = repo_path / ".git"
+    (git_dir / "refs" / "heads").mkdir(parents=True)
+    (git_dir / "objects").mkdir()
+    (git_dir / "HEAD").write_text("ref: refs/heads/main\n")
+    (git_dir / "config").write_text("[core]\n\trepositoryformatversion = 0\n")
+    
+    return repo_path
+
+@pytest.fixture
+def temp_repo(tmp_path, _seed_repo):
+    """
+    Create a temporary git repository for testing.
+    
+    Like temp_files, every file is a hardlink to the session seed, so
+    replace files rather than writing to them in place.
+    """
+    repo_path = tmp_path / "repo"
+    shutil.copytree(_seed_repo, repo_path, copy_function=os.link)
+    return repo_path
 
 @pytest.fixture
+def empty_repo(tmp_path):
+    """Create a temporary git repository with no tracked files."""
+    repo_path = tmp_path / "repo"
+    (repo_path / ".git").mkdir(parents=True)
+    return repo_path
+
+@pytest.fixture(autouse=True)
+def isolated_fix_cache(tmp_path, monkeypatch):
+    """Keep the persistent LLM fix cache out of the user's home directory."""
+    monkeypatch.setenv("CODEFIXER_FIX_CACHE_DIR", str(tmp_path / "fix_cache"))
+
+@pytest.fixture(scope="session")
 def mock_llm_response():
     """Mock LLM response for testing."""
     return """
@@ -60,50 +114,50 @@ def hello_world():
 ```
 """
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_issues():
-    """Sample linting issues for testing."""
-    return [
-        {
+    """Sample linting issues for testing (shared and read-only)."""
+    return (
+        MappingProxyType({
             "path": "test_file.py",
             "row": 2,
             "col": 1,
             "code": "E302",
             "text": "expected 2 blank lines, found 1"
-        },
-        {
+        }),
+        MappingProxyType({
             "path": "test_file.py", 
             "row": 3,
             "col": 5,
             "code": "E501",
             "text": "line too long (80 > 79 characters)"
-        }
-    ]
+        })
+    )
 
 @pytest.fixture
-def mock_env_manager():
+def mock_env_manager(tmp_path_factory):
     """Mock environment manager for testing."""
     class MockEnvManager:
-        def __init__(self):
+        def __init__(self, tmp_path_factory):
+            self.tmp_path_factory = tmp_path_factory
             self.envs = {}
         
         def get_language_env(self, language: str, repo_path: Path) -> Path:
-            temp_dir = tempfile.mkdtemp()
-            self.envs[f"{language}_{repo_path.name}"] = temp_dir
-            return Path(temp_dir)
+            # pytest removes these along with the rest of the session's temp dirs
+            env_name = f"{language}_{repo_path.name}"
+            env_path = self.tmp_path_factory.mktemp(env_name, numbered=True)
+            self.envs[env_name] = env_path
+            return env_path
         
         def cleanup_all(self):
-            for env_path in self.envs.values():
-                if os.path.exists(env_path):
-                    shutil.rmtree(env_path)
             self.envs.clear()
     
-    return MockEnvManager()
+    return MockEnvManager(tmp_path_factory)
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_languages():
-    """Sample detected languages for testing."""
-    return {
-        "python": [Path("test_file.py"), Path("bad_code.py")],
-        "javascript": [Path("test.js")]
-    } 
\ No newline at end of file
+    """Sample detected languages for testing (shared and read-only)."""
+    return MappingProxyType({
+        "python": (Path("test_file.py"), Path("bad_code.py")),
+        "javascript": (Path("test.js"),)
+    }) 
\ No newline at end of file
@@ -6,9 +6,13 @@ import pytest
 from issue_deduplicator import (
     deduplicate_issues,
     prioritize_issues,
+    prioritize_issues_annotated,
     filter_issues_by_severity,
+    filter_issues_by_severity_annotated,
     group_issues_by_type,
-    create_issue_key
+    create_issue_key,
+    classify,
+    annotate_issues
 )
 
 
@@ -62,6 +66,15 @@ class TestIssueDeduplication:
         
         assert len(deduplicated["file1.py"]) == 4  # All should be kept as they're different
     
+    def test_deduplicate_issues_exact_copies_keep_original(self):
+        """Test that exact copies collapse to the original issue unchanged."""
+        issue = {"row": 1, "col": 1, "code": "E302", "text": "Issue 1"}
+        issues = {"file1.py": [issue, dict(issue), dict(issue)]}
+        
+        deduplicated = deduplicate_issues(issues)
+        
+        assert deduplicated["file1.py"] == [issue]
+    
     def test_create_issue_key(self):
         """Test issue key creation."""
         issue = {"path": "file1.py", "row": 1, "col": 1, "code": "E302", "text": "Issue 1"}
@@ -125,6 +138,23 @@ class TestIssuePrioritization:
         for code in formatting_codes:
             assert any(issue["code"] == code for issue in prioritized)
     
+    def test_prioritize_issues_numpy_matches_python(self, monkeypatch):
+        """Test that the NumPy sort gives the same order as the Python sort."""
+        pytest.importorskip("numpy")
+        import issue_deduplicator
+        
+        issues = [
+            {"path": f"file{i}.py", "row": i, "col": 1, "code": code, "text": "issue"}
+            for i, code in enumerate(["E501", "S101", "F401", "E501", "indent", "S105", "F401", "custom"])
+        ]
+        expected_order = prioritize_issues(issues)
+        expected_filtered = filter_issues_by_severity(issues, "high")
+        
+        monkeypatch.setattr(issue_deduplicator, "NUMPY_MIN_ISSUES", 0)
+        
+        assert prioritize_issues(issues) == expected_order
+        assert filter_issues_by_severity(issues, "high") == expected_filtered
+    
     def test_prioritize_issues_security_keywords(self):
         """Test that issues with security keywords are prioritized."""
         issues = [
@@ -276,4 +306,54 @@ class TestIssueGrouping:
         grouped = group_issues_by_type(issues)
         
         assert len(grouped["security"]) == 2
-        assert len(grouped["unused_code"]) == 2 
\ No newline at end of file
+        assert len(grouped["unused_code"]) == 2
+    
+    def test_classify_merged_code(self):
+        """Test that merged codes are classified by their most important part."""
+        assert classify("E302+F401") == ("unused_code", 3, 50)
+        assert classify("E501", "Unsafe use of eval") == ("formatting", 4, 100)
+    
+    def test_classify_unmatched_code(self):
+        """Test that codes matching no known fragment fall back to the text."""
+        assert classify("W291", "trailing whitespace") == ("other", 1, 25)
+        assert classify("D100", "Unsafe default") == ("other", 4, 100)
+    
+    def test_annotations_shared_across_passes(self):
+        """Test that precomputed annotations give the same results as classifying again."""
+        issues = [
+            {"path": "file1.py", "row": 1, "col": 1, "code": "E501", "text": "Line too long"},
+            {"path": "file2.py", "row": 2, "col": 2, "code": "S101", "text": "Use of assert detected"},
+            {"path": "file3.py", "row": 3, "col": 3, "code": "F401", "text": "Unused import"},
+        ]
+        
+        annotations = annotate_issues(issues)
+        
+        assert [category for category, _, _ in annotations] == ["formatting", "security", "unused_code"]
+        assert prioritize_issues(issues, annotations) == prioritize_issues(issues)
+        assert filter_issues_by_severity(issues, "high", annotations) == filter_issues_by_severity(issues, "high")
+        assert group_issues_by_type(issues, annotations) == group_issues_by_type(issues)
+    
+    def test_pipeline_classifies_each_issue_once(self, monkeypatch):
+        """Test that prioritizing, filtering and grouping classify every issue only once."""
+        import issue_deduplicator
+        issues = [
+            {"path": "file1.py", "row": 1, "col": 1, "code": "E501", "text": "Line too long"},
+            {"path": "file1.py", "row": 2, "col": 2, "code": "S101", "text": "Use of assert detected"},
+            {"path": "file1.py", "row": 3, "col": 3, "code": "F401", "text": "Unused import"},
+        ]
+        calls = []
+        
+        def counting_classify(code, text=''):
+            calls.append(code)
+            return classify.__wrapped__(code, text)
+        
+        monkeypatch.setattr(issue_deduplicator, "classify", counting_classify)
+        
+        prioritized, annotations = prioritize_issues_annotated(issues)
+        filtered, annotations = filter_issues_by_severity_annotated(prioritized, "medium", annotations)
+        grouped = group_issues_by_type(filtered, annotations)
+        
+        assert sorted(calls) == ["E501", "F401", "S101"]
+        assert [issue["code"] for issue in filtered] == ["S101", "F401"]
+        assert annotations == [classify("S101", "Use of assert detected"), classify("F401", "Unused import")]
+        assert grouped == {"security": [issues[1]], "unused_code": [issues[2]]}
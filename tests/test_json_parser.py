@@ -0,0 +1,207 @@
+"""
+Tests for JSON parsing utilities.
+"""
+
+import json
+import pytest
+from pathlib import Path
+from utils import json_parser
+from utils.json_parser import (
+    _loads,
+    convert_generic_json,
+    extract_json_objects,
+    parse_json_safe,
+    parse_linter_output,
+    parse_ndjson,
+    parse_linter_text
+)
+
+
+class TestExtractJsonObjects:
+    """Test extraction of JSON objects from mixed text."""
+    
+    def test_extracts_objects_from_text(self):
+        """Test that objects surrounded by text are extracted in order."""
+        text = 'warning: {"code": "E1"} and then {"code": "E2"} done'
+        assert extract_json_objects(text) == [{"code": "E1"}, {"code": "E2"}]
+    
+    def test_deeply_nested_object(self):
+        """Test that nesting deeper than one level yields the outer object."""
+        text = 'x {"a": {"b": {"c": 1}}} y'
+        assert extract_json_objects(text) == [{"a": {"b": {"c": 1}}}]
+    
+    def test_braces_inside_strings(self):
+        """Test that braces inside string values do not end the object."""
+        text = '{"text": "expected }"} {"text": "{"}'
+        assert extract_json_objects(text) == [{"text": "expected }"}, {"text": "{"}]
+    
+    def test_skips_invalid_objects(self):
+        """Test that malformed brace spans are skipped."""
+        text = '{not json} {"ok": true} {"broken": '
+        assert extract_json_objects(text) == [{"ok": True}]
+    
+    def test_no_objects(self):
+        """Test text without any JSON objects."""
+        assert extract_json_objects("plain text output") == []
+
+
+class TestParseJsonSafe:
+    """Test JSON parsing with fallbacks."""
+    
+    def test_parses_array(self):
+        """Test parsing a JSON array."""
+        assert parse_json_safe('[{"a": 1}, {"b": 2}]') == [{"a": 1}, {"b": 2}]
+    
+    def test_parses_ndjson(self):
+        """Test parsing newline-delimited JSON."""
+        assert parse_json_safe('{"a": 1}\n\n{"b": 2}\n') == [{"a": 1}, {"b": 2}]
+    
+    def test_parse_ndjson_bytes(self):
+        """Test that raw ndjson bytes parse like text and bad lines are skipped."""
+        data = b'{"a": 1}\r\n[1, 2]\n\xff\xfe\n  {"b": "\xc3\xa9"}  '
+        assert parse_ndjson(data) == [{"a": 1}, {"b": "é"}]
+    
+    def test_falls_back_to_extraction(self):
+        """Test that invalid JSON falls back to object extraction."""
+        assert parse_json_safe('{"a": 1} trailing {"b": 2}') == [{"a": 1}, {"b": 2}]
+    
+    def test_uses_stdlib_decode_error(self):
+        """Test that decode errors from the active parser are json.JSONDecodeError."""
+        with pytest.raises(json.JSONDecodeError):
+            _loads("{not json}")
+
+
+class TestParseLinterText:
+    """Test the text-output fallback parser."""
+    
+    def test_flake8(self):
+        """Test parsing flake8 text output."""
+        output = "a.py:3:1: E302 expected 2 blank lines\n# comment\na.py:10:80: E501 line too long\n"
+        issues = parse_linter_text(output, Path("a.py"), "flake8")
+        
+        assert issues == [
+            {"path": "a.py", "row": 3, "col": 1, "code": "E302", "text": "expected 2 blank lines"},
+            {"path": "a.py", "row": 10, "col": 80, "code": "E501", "text": "line too long"},
+        ]
+    
+    def test_eslint(self):
+        """Test parsing ESLint stylish output."""
+        output = "  4:7  error  'x' is assigned a value but never used  (no-unused-vars)\n  9:1  warning  Unexpected console statement  (no-console)"
+        issues = parse_linter_text(output, Path("app.js"), "eslint")
+        
+        assert [(i["row"], i["col"], i["code"]) for i in issues] == [(4, 7, "no-unused-vars"), (9, 1, "no-console")]
+        assert issues[0]["text"] == "'x' is assigned a value but never used"
+    
+    def test_mypy(self):
+        """Test parsing mypy output, which has no column."""
+        output = "m.py:12: error: Incompatible return value type\nSuccess: no issues found"
+        issues = parse_linter_text(output, Path("m.py"), "mypy")
+        
+        assert issues == [
+            {"path": "m.py", "row": 12, "col": 1, "code": "mypy", "text": "Incompatible return value type"},
+        ]
+    
+    def test_generic(self):
+        """Test the generic file:line:col: message pattern."""
+        issues = parse_linter_text("x.go:5:2: undefined: foo", Path("x.go"), "golint")
+        
+        assert issues == [{"path": "x.go", "row": 5, "col": 2, "code": "unknown", "text": "undefined: foo"}]
+    
+    def test_matches_do_not_span_lines(self):
+        """Test that a record split over two lines is not stitched together."""
+        output = "  4:7\n  error  'x' is unused  (no-unused-vars)\n\n  5:1  error  Missing semicolon  (semi)"
+        issues = parse_linter_text(output, Path("app.js"), "eslint")
+        
+        assert [(i["row"], i["code"]) for i in issues] == [(5, "semi")]
+    
+    def test_large_flake8_output_matches_line_parser(self, monkeypatch):
+        """Test that the bulk flake8 path matches the per-line parser."""
+        output = "".join(f"a.py:{n}:{n % 80 + 1}: E{n % 900 + 100} message {n} \n# skipped\n" for n in range(1, 500))
+        expected = parse_linter_text(output, Path("a.py"), "flake8")
+        
+        monkeypatch.setattr(json_parser, "BULK_PARSE_MIN_CHARS", 0)
+        assert parse_linter_text(output, Path("a.py"), "flake8") == expected
+        assert len(expected) == 499
+    
+    def test_empty_output(self):
+        """Test that empty output yields no issues."""
+        assert parse_linter_text("", Path("a.py"), "flake8") == []
+
+
+class TestConvertGenericJson:
+    """Test conversion of generic linter JSON to issues."""
+    
+    def test_alternative_field_names(self):
+        """Test that each field falls back through the known names."""
+        data = [
+            {"line": 3, "column": 4, "code": "X1", "message": "first"},
+            {"row": 5, "col": 0, "rule": "X2", "text": "second"},
+            {"line_number": 7, "column_number": 2, "ruleId": "X3"},
+        ]
+        issues = convert_generic_json(data, Path("f.txt"))
+        
+        assert [(i["row"], i["col"], i["code"], i["text"]) for i in issues] == [
+            (3, 4, "X1", "first"),
+            (5, 0, "X2", "second"),
+            (7, 2, "X3", ""),
+        ]
+    
+    def test_defaults_and_non_dict_items(self):
+        """Test defaults for missing fields and that non-dict items are skipped."""
+        issues = convert_generic_json([{"line": None}, "noise", 3], Path("f.txt"))
+        
+        assert issues == [{"path": "f.txt", "row": 1, "col": 1, "code": "unknown", "text": ""}]
+    
+    def test_parse_linter_output_uses_generic_json(self):
+        """Test that generic JSON output is converted rather than falling back to text."""
+        output = '[{"line": 2, "column": 1, "rule": "no-tabs", "message": "tab found"}]'
+        issues = parse_linter_output(output, Path("f.yml"), "yamllint")
+        
+        assert issues == [{"path": "f.yml", "row": 2, "col": 1, "code": "no-tabs", "text": "tab found"}]
+
+
+class TestParseLinterJson:
+    """Test the per-linter JSON parsers."""
+    
+    def test_flake8_json(self):
+        """Test flake8 JSON output through parse_linter_output."""
+        output = '[{"line_number": 4, "column_number": 2, "code": "F401", "text": "unused import"}]'
+        
+        assert parse_linter_output(output, Path("a.py"), "flake8") == [
+            {"path": "a.py", "row": 4, "col": 2, "code": "F401", "text": "unused import"},
+        ]
+    
+    def test_eslint_json(self):
+        """Test ESLint JSON output with a list of file results."""
+        output = '[{"messages": [{"line": 1, "column": 5, "ruleId": "semi", "message": "Missing semicolon"}]}]'
+        
+        assert parse_linter_output(output, Path("app.js"), "eslint") == [
+            {"path": "app.js", "row": 1, "col": 5, "code": "semi", "text": "Missing semicolon"},
+        ]
+    
+    def test_mypy_json_filters_other_files(self):
+        """Test that mypy results for other files are dropped."""
+        output = (
+            '[{"path": "other.py", "messages": [{"line": 1, "message": "skip"}]},'
+            ' {"path": "m.py", "messages": [{"line": 7, "column": 3, "message": "keep"}]}]'
+        )
+        
+        assert parse_linter_output(output, Path("m.py"), "mypy") == [
+            {"path": "m.py", "row": 7, "col": 3, "code": "mypy", "text": "keep"},
+        ]
+    
+    def test_codes_are_interned(self, monkeypatch):
+        """Test that equal codes from separate outputs share one string object."""
+        first = parse_linter_output('[{"line_number": 1, "code": "XQ917"}]', Path("a.py"), "flake8")
+        second = parse_linter_output('[{"line": 2, "rule": "XQ917"}]', Path("b.txt"), "yamllint")
+        text = parse_linter_text("a.py:3:1: XQ917 message\n", Path("a.py"), "flake8")
+        monkeypatch.setattr(json_parser, "BULK_PARSE_MIN_CHARS", 0)
+        bulk = parse_linter_text("a.py:4:1: XQ917 message\n", Path("a.py"), "flake8")
+        
+        assert first[0]["code"] is second[0]["code"] is text[0]["code"] is bulk[0]["code"]
+    
+    def test_missing_rule_id_is_kept(self):
+        """Test that a null ESLint rule id is passed through rather than interned."""
+        output = '[{"messages": [{"line": 1, "column": 1, "ruleId": null, "message": "Parsing error"}]}]'
+        
+        assert parse_linter_output(output, Path("app.js"), "eslint")[0]["code"] is None
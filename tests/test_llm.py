@@ -2,25 +2,34 @@
 Tests for LLM integration module.
 """
 
+import os
+import subprocess
 import pytest
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch, MagicMock
 from pathlib import Path
 from llm import (
     build_prompt, 
     extract_code_from_response, 
     generate_fix,
+    generate_fixes,
     list_available_models,
     list_ollama_models,
-    list_llamacpp_models
+    list_llamacpp_models,
+    run_ollama,
+    _ollama_available,
+    _adaptive_timeout,
+    _fix_cache_get,
+    _fix_cache_set
 )
 
 
 class TestLLMIntegration:
     """Test LLM integration functionality."""
     
-    def test_build_prompt(self, sample_issues, temp_repo):
+    def test_build_prompt(self, sample_issues, temp_files):
         """Test prompt building functionality."""
-        file_path = temp_repo / "test_file.py"
+        file_path = temp_files / "test_file.py"
         
         prompt = build_prompt(file_path, sample_issues)
         
@@ -32,9 +41,9 @@ class TestLLMIntegration:
         assert "expected 2 blank lines" in prompt
         assert "line too long" in prompt
     
-    def test_build_prompt_empty_issues(self, temp_repo):
+    def test_build_prompt_empty_issues(self, temp_files):
         """Test prompt building with empty issues list."""
-        file_path = temp_repo / "test_file.py"
+        file_path = temp_files / "test_file.py"
         
         prompt = build_prompt(file_path, [])
         
@@ -42,6 +51,33 @@ class TestLLMIntegration:
         assert "test_file.py" in prompt
         assert "def hello_world()" in prompt
     
+    def test_build_prompt_rereads_modified_file(self, sample_issues, temp_files):
+        """Test that cached source is invalidated when the file changes."""
+        file_path = temp_files / "test_file.py"
+        
+        assert "def hello_world()" in build_prompt(file_path, sample_issues)
+        
+        file_path.unlink()
+        file_path.write_text("def goodbye_world():\n    return False\n")
+        prompt = build_prompt(file_path, sample_issues)
+        
+        assert "def goodbye_world()" in prompt
+        assert "def hello_world()" not in prompt
+    
+    def test_build_prompt_truncates_many_issues(self, temp_files):
+        """Test that only the top issues are listed with an omitted count."""
+        file_path = temp_files / "test_file.py"
+        issues = [
+            {"row": i, "col": 1, "code": "E501", "text": f"issue {i}"}
+            for i in range(1, 13)
+        ]
+        
+        prompt = build_prompt(file_path, issues)
+        
+        assert "Line 10, Column 1: E501 - issue 10" in prompt
+        assert "issue 11" not in prompt
+        assert "and 2 more issues" in prompt
+    
     def test_extract_code_from_response_success(self, mock_llm_response):
         """Test successful code extraction from LLM response."""
         extracted_code = extract_code_from_response(mock_llm_response)
@@ -85,6 +121,7 @@ def main():
         assert extracted_code is not None
         assert "def main()" in extracted_code
         assert "print(\"Hello\")" in extracted_code
+        assert "def helper()" not in extracted_code
     
     def test_extract_code_from_response_different_languages(self):
         """Test code extraction with different language specifiers."""
@@ -102,8 +139,24 @@ function test() {
         assert "function test()" in extracted_code
         assert "console.log(\"Hello\")" in extracted_code
     
+    def test_extract_code_from_response_unterminated_block(self):
+        """Test code extraction when the closing fence is missing."""
+        response = "Fixed:\n```python\ndef main():\n    return True\n"
+        
+        extracted_code = extract_code_from_response(response)
+        
+        assert extracted_code == "def main():\n    return True"
+    
+    def test_extract_code_from_response_without_fences(self):
+        """Test code extraction falls back to code-like lines without fences."""
+        response = "Sure, here you go\ndef main():\n    return 42"
+        
+        extracted_code = extract_code_from_response(response)
+        
+        assert extracted_code == "def main():\n    return 42"
+    
     @patch('llm.run_ollama')
-    def test_generate_fix_ollama_success(self, mock_run_ollama, sample_issues, temp_repo):
+    def test_generate_fix_ollama_success(self, mock_run_ollama, sample_issues, temp_files):
         """Test successful fix generation with Ollama."""
         mock_run_ollama.return_value = """
 Here's the fixed code:
@@ -115,7 +168,7 @@ def hello_world():
 ```
 """
         
-        file_path = temp_repo / "test_file.py"
+        file_path = temp_files / "test_file.py"
         result = generate_fix(file_path, sample_issues, "test-model", "ollama")
         
         assert result is not None
@@ -123,7 +176,7 @@ def hello_world():
         mock_run_ollama.assert_called_once()
     
     @patch('llm.run_llama_cpp')
-    def test_generate_fix_llamacpp_success(self, mock_run_llamacpp, sample_issues, temp_repo):
+    def test_generate_fix_llamacpp_success(self, mock_run_llamacpp, sample_issues, temp_files):
         """Test successful fix generation with llama.cpp."""
         mock_run_llamacpp.return_value = """
 Here's the fixed code:
@@ -135,7 +188,7 @@ def hello_world():
 ```
 """
         
-        file_path = temp_repo / "test_file.py"
+        file_path = temp_files / "test_file.py"
         result = generate_fix(file_path, sample_issues, "test-model", "llama.cpp")
         
         assert result is not None
@@ -143,42 +196,221 @@ def hello_world():
         mock_run_llamacpp.assert_called_once()
     
     @patch('llm.run_ollama')
-    def test_generate_fix_ollama_failure(self, mock_run_ollama, sample_issues, temp_repo):
+    def test_generate_fix_ollama_failure(self, mock_run_ollama, sample_issues, temp_files):
         """Test fix generation when Ollama fails."""
         mock_run_ollama.return_value = None
         
-        file_path = temp_repo / "test_file.py"
+        file_path = temp_files / "test_file.py"
         result = generate_fix(file_path, sample_issues, "test-model", "ollama")
         
         assert result is None
     
     @patch('llm.run_ollama')
-    def test_generate_fix_ollama_empty_response(self, mock_run_ollama, sample_issues, temp_repo):
+    def test_generate_fix_ollama_empty_response(self, mock_run_ollama, sample_issues, temp_files):
         """Test fix generation with empty LLM response."""
         mock_run_ollama.return_value = ""
         
-        file_path = temp_repo / "test_file.py"
+        file_path = temp_files / "test_file.py"
         result = generate_fix(file_path, sample_issues, "test-model", "ollama")
         
         assert result is None
     
-    def test_generate_fix_unknown_runner(self, sample_issues, temp_repo):
+    def test_generate_fix_unknown_runner(self, sample_issues, temp_files):
         """Test fix generation with unknown runner."""
-        file_path = temp_repo / "test_file.py"
+        file_path = temp_files / "test_file.py"
         result = generate_fix(file_path, sample_issues, "test-model", "unknown")
         
         assert result is None
     
     @patch('llm.build_prompt')
-    def test_generate_fix_prompt_failure(self, mock_build_prompt, sample_issues, temp_repo):
+    def test_generate_fix_prompt_failure(self, mock_build_prompt, sample_issues, temp_files):
         """Test fix generation when prompt building fails."""
         mock_build_prompt.return_value = None
         
-        file_path = temp_repo / "test_file.py"
+        file_path = temp_files / "test_file.py"
         result = generate_fix(file_path, sample_issues, "test-model", "ollama")
         
         assert result is None
     
+    @patch('llm.run_ollama')
+    def test_generate_fix_no_issues(self, mock_run_ollama, temp_files):
+        """Test that the LLM is not called when there is nothing to fix."""
+        result = generate_fix(temp_files / "test_file.py", [], "test-model", "ollama")
+        
+        assert result is None
+        mock_run_ollama.assert_not_called()
+    
+    @patch('llm.run_ollama')
+    def test_generate_fix_deduplicates_issues(self, mock_run_ollama, mock_llm_response, temp_files):
+        """Test that repeated issues only appear once in the prompt."""
+        mock_run_ollama.return_value = mock_llm_response
+        issue = {"row": 1, "col": 1, "code": "E302", "text": "expected 2 blank lines"}
+        
+        generate_fix(temp_files / "test_file.py", [issue, dict(issue), dict(issue)], "test-model", "ollama")
+        
+        prompt = mock_run_ollama.call_args.args[0]
+        assert prompt.count("E302") == 1
+    
+    def test_adaptive_timeout(self):
+        """Test that the timeout grows with prompt length above the minimum."""
+        assert _adaptive_timeout("x" * 400, min_timeout=30, throughput=80) == 30
+        assert _adaptive_timeout("x" * 400000, min_timeout=30, throughput=80) == 2500
+        assert _adaptive_timeout("x" * 400000, min_timeout=30, throughput=40) == 5000
+    
+    @patch.dict('os.environ', {'CODEFIXER_LLM_TIMEOUT': '1'})
+    @patch('llm.time.sleep')
+    @patch('llm.run_ollama')
+    def test_generate_fix_timeout_retry_allows_more_time(self, mock_run_ollama, mock_sleep, mock_llm_response, sample_issues, temp_files):
+        """Test that a timed out request is retried with a longer timeout."""
+        mock_run_ollama.side_effect = [subprocess.TimeoutExpired("ollama", 30), mock_llm_response]
+        
+        file_path = temp_files / "test_file.py"
+        result = generate_fix(file_path, sample_issues, "test-model", "ollama", timeout=1)
+        
+        assert result is not None
+        first_timeout = mock_run_ollama.call_args_list[0].args[2]
+        second_timeout = mock_run_ollama.call_args_list[1].args[2]
+        assert second_timeout > first_timeout
+    
+    @patch.dict('os.environ', {'CODEFIXER_LLM_TIMEOUT': '90'})
+    @patch('llm.run_ollama')
+    def test_generate_fix_env_timeout_is_floor(self, mock_run_ollama, mock_llm_response, sample_issues, temp_files):
+        """Test that CODEFIXER_LLM_TIMEOUT raises the minimum request timeout."""
+        mock_run_ollama.return_value = mock_llm_response
+        
+        generate_fix(temp_files / "test_file.py", sample_issues, "test-model", "ollama", timeout=30)
+        
+        assert mock_run_ollama.call_args.args[2] == 90
+    
+    @patch.dict('os.environ', {'CODEFIXER_LLM_THROUGHPUT': 'fast', 'CODEFIXER_LLM_TIMEOUT': '-5'})
+    @patch('llm.run_ollama')
+    def test_generate_fix_invalid_timeout_settings(self, mock_run_ollama, mock_llm_response, sample_issues, temp_files):
+        """Test that bad timeout values fall back to defaults instead of raising."""
+        mock_run_ollama.return_value = mock_llm_response
+        
+        result = generate_fix(temp_files / "test_file.py", sample_issues, "test-model", "ollama", timeout="soon")
+        
+        assert result is not None
+        assert mock_run_ollama.call_args.args[2] == 60
+    
+    @patch('llm.run_ollama')
+    def test_generate_fix_uses_cache(self, mock_run_ollama, mock_llm_response, sample_issues, temp_files):
+        """Test that a validated fix is reused for the same code, issues and model."""
+        mock_run_ollama.return_value = mock_llm_response
+        
+        file_path = temp_files / "test_file.py"
+        first = generate_fix(file_path, sample_issues, "test-model", "ollama")
+        second = generate_fix(file_path, sample_issues, "test-model", "ollama")
+        
+        assert first is not None
+        assert second == first
+        mock_run_ollama.assert_called_once()
+        
+        # A different model must not hit the cache
+        generate_fix(file_path, sample_issues, "other-model", "ollama")
+        assert mock_run_ollama.call_count == 2
+    
+    @patch('llm.run_llama_cpp')
+    @patch('llm.run_ollama')
+    def test_fix_cache_key_covers_runner_and_prompt(self, mock_run_ollama, mock_run_llama_cpp, mock_llm_response, sample_issues, temp_files):
+        """Test that switching runners or editing the prompt template misses the cache."""
+        mock_run_ollama.return_value = mock_llm_response
+        mock_run_llama_cpp.return_value = mock_llm_response
+        
+        file_path = temp_files / "test_file.py"
+        generate_fix(file_path, sample_issues, "test-model", "ollama")
+        generate_fix(file_path, sample_issues, "test-model", "llama.cpp")
+        mock_run_llama_cpp.assert_called_once()
+        
+        with patch('llm.load_prompt_template', return_value="Fix {file_path}:\n{code}\n{issues}"):
+            generate_fix(file_path, sample_issues, "test-model", "ollama")
+        assert mock_run_ollama.call_count == 2
+    
+    def test_fix_cache_evicts_least_recently_used(self, tmp_path, monkeypatch):
+        """Test that writes past CODEFIXER_FIX_CACHE_MAX_MB drop the oldest entries."""
+        cache_dir = tmp_path / "fix_cache"
+        monkeypatch.setenv("CODEFIXER_FIX_CACHE_MAX_MB", str(2.5 * 1024 / (1024 * 1024)))
+        
+        for index, key in enumerate(["a", "b"]):
+            _fix_cache_set(key, "x" * 1024)
+            os.utime(cache_dir / f"{key}.txt", ns=(index * 10**9, index * 10**9))
+        
+        # Reading "a" makes it the most recently used entry
+        assert _fix_cache_get("a") == "x" * 1024
+        _fix_cache_set("c", "x" * 1024)
+        
+        assert sorted(p.stem for p in cache_dir.iterdir()) == ["a", "c"]
+    
+    @patch('llm.generate_fix')
+    def test_generate_fixes_collects_results(self, mock_generate_fix, sample_issues):
+        """Test that concurrent fix generation keeps only successful fixes."""
+        mock_generate_fix.side_effect = lambda path, *args: None if path.name == "bad.py" else f"fixed {path.name}"
+        progress = MagicMock()
+        
+        fixes = generate_fixes(
+            [("good.py", sample_issues), ("bad.py", sample_issues), ("other.py", sample_issues)],
+            "test-model", "ollama", max_workers=2, progress=progress
+        )
+        
+        assert fixes == {"good.py": "fixed good.py", "other.py": "fixed other.py"}
+        assert mock_generate_fix.call_count == 3
+        assert progress.call_count == 3
+    
+    @pytest.mark.parametrize("value", ["many", "0"])
+    @patch('llm.ThreadPoolExecutor', wraps=ThreadPoolExecutor)
+    @patch('llm.generate_fix', return_value="fixed")
+    def test_generate_fixes_invalid_parallel_setting(self, mock_generate_fix, mock_executor, value, sample_issues, monkeypatch):
+        """Test that an invalid CODEFIXER_LLM_PARALLEL falls back to the default."""
+        monkeypatch.setenv("CODEFIXER_LLM_PARALLEL", value)
+        
+        fixes = generate_fixes([(f"f{i}.py", sample_issues) for i in range(6)], "test-model", "ollama")
+        
+        assert len(fixes) == 6
+        assert mock_executor.call_args.kwargs["max_workers"] == 4
+    
+    def test_generate_fixes_empty(self):
+        """Test that no work is scheduled for an empty job list."""
+        assert generate_fixes([]) == {}
+    
+    @patch('llm.subprocess.run')
+    @patch('llm.shutil.which')
+    def test_run_ollama_not_installed(self, mock_which, mock_subprocess):
+        """Test that a missing ollama binary is detected without spawning it."""
+        mock_which.return_value = None
+        _ollama_available.cache_clear()
+        
+        try:
+            assert run_ollama("prompt", "test-model") is None
+        finally:
+            _ollama_available.cache_clear()
+        
+        mock_subprocess.assert_not_called()
+    
+    @patch('llm.shutil.which')
+    def test_ollama_available_rechecks_until_found(self, mock_which):
+        """Test that a missing runner is looked up again but a found one is remembered."""
+        mock_which.return_value = None
+        _ollama_available.cache_clear()
+        
+        try:
+            assert _ollama_available() is False
+            mock_which.return_value = "/usr/bin/ollama"
+            assert _ollama_available() is True
+            assert _ollama_available() is True
+        finally:
+            _ollama_available.cache_clear()
+        
+        assert mock_which.call_count == 2
+    
+    @patch('llm.subprocess.run')
+    @patch('llm._ollama_available', return_value=True)
+    def test_run_ollama_passes_timeout(self, mock_available, mock_subprocess):
+        """Test that run_ollama returns the whole output and applies the timeout."""
+        mock_subprocess.return_value = MagicMock(returncode=0, stdout="```python\nx = 1\n```\n", stderr="")
+        
+        assert run_ollama("prompt", "test-model", timeout=42) == "```python\nx = 1\n```"
+        assert mock_subprocess.call_args.kwargs["timeout"] == 42
+    
     @patch('llm.subprocess.run')
     def test_list_ollama_models_success(self, mock_subprocess):
         """Test successful listing of Ollama models."""
@@ -206,15 +438,15 @@ phi3:3b                phi3:3b         3B      2024-01-01 12:00:00
         
         assert models == []
     
-    @patch('llm.Path.exists')
-    @patch('llm.Path.glob')
-    def test_list_llamacpp_models_success(self, mock_glob, mock_exists):
+    @patch('llm.Path.home')
+    def test_list_llamacpp_models_success(self, mock_home, tmp_path):
         """Test successful listing of llama.cpp models."""
-        mock_exists.return_value = True
-        mock_glob.return_value = [
-            Path("/usr/local/share/llama.cpp/models/model1.gguf"),
-            Path("/usr/local/share/llama.cpp/models/model2.gguf")
-        ]
+        mock_home.return_value = tmp_path
+        model_dir = tmp_path / "llama.cpp" / "models"
+        model_dir.mkdir(parents=True)
+        (model_dir / "model1.gguf").write_bytes(b"")
+        (model_dir / "model2.gguf").write_bytes(b"")
+        (model_dir / "README.md").write_text("not a model")
         
         models = list_llamacpp_models()
         
@@ -258,7 +490,7 @@ phi3:3b                phi3:3b         3B      2024-01-01 12:00:00
         assert models == []
     
     @patch('llm.run_ollama')
-    def test_generate_fix_with_retry_success(self, mock_run_ollama, sample_issues, temp_repo):
+    def test_generate_fix_with_retry_success(self, mock_run_ollama, sample_issues, temp_files):
         """Test fix generation with retry mechanism."""
         # First call fails, second succeeds
         mock_run_ollama.side_effect = [
@@ -274,7 +506,7 @@ def hello_world():
 """
         ]
         
-        file_path = temp_repo / "test_file.py"
+        file_path = temp_files / "test_file.py"
         result = generate_fix(file_path, sample_issues, "test-model", "ollama", timeout=30, max_retries=3)
         
         assert result is not None
@@ -282,11 +514,11 @@ def hello_world():
         assert mock_run_ollama.call_count == 2
     
     @patch('llm.run_ollama')
-    def test_generate_fix_with_retry_all_fail(self, mock_run_ollama, sample_issues, temp_repo):
+    def test_generate_fix_with_retry_all_fail(self, mock_run_ollama, sample_issues, temp_files):
         """Test fix generation when all retries fail."""
         mock_run_ollama.return_value = None
         
-        file_path = temp_repo / "test_file.py"
+        file_path = temp_files / "test_file.py"
         result = generate_fix(file_path, sample_issues, "test-model", "ollama", timeout=30, max_retries=3)
         
         assert result is None
@@ -294,11 +526,11 @@ def hello_world():
     
     @patch('llm.time.sleep')  # Mock sleep to speed up tests
     @patch('llm.run_ollama')
-    def test_generate_fix_retry_backoff(self, mock_run_ollama, mock_sleep, sample_issues, temp_repo):
+    def test_generate_fix_retry_backoff(self, mock_run_ollama, mock_sleep, sample_issues, temp_files):
         """Test that retry uses exponential backoff."""
         mock_run_ollama.return_value = None
         
-        file_path = temp_repo / "test_file.py"
+        file_path = temp_files / "test_file.py"
         result = generate_fix(file_path, sample_issues, "test-model", "ollama", timeout=30, max_retries=3)
         
         # Check that sleep was called with exponential backoff values
@@ -0,0 +1,132 @@
+"""
+Tests for memory monitoring utilities.
+"""
+
+import functools
+import gc
+import os
+import sys
+import pytest
+from unittest.mock import patch
+from utils import memory_monitor
+from utils.memory_monitor import MemoryMonitor, optimize_memory_usage, register_cache
+
+
+class TestMemoryMonitor:
+    """Test memory usage readings and status checks."""
+    
+    def test_reports_resident_memory(self):
+        """Test that the reading is a plausible resident set size."""
+        usage = MemoryMonitor().get_memory_usage()
+        
+        assert usage > 1024 * 1024
+    
+    @pytest.mark.skipif(sys.platform != "linux", reason="reads /proc/self/statm")
+    def test_statm_matches_psutil(self):
+        """Test that the /proc/self/statm reading agrees with psutil."""
+        psutil = pytest.importorskip("psutil")
+        monitor = MemoryMonitor()
+        
+        assert abs(monitor._read_rss() - psutil.Process().memory_info().rss) < 8 * 1024 * 1024
+    
+    @pytest.mark.skipif(sys.platform != "linux", reason="reads /proc/self/statm")
+    def test_statm_descriptor_is_closed(self):
+        """Test that closing, leaving a with block or dropping a monitor releases its descriptor."""
+        def open_fds():
+            return len(os.listdir("/proc/self/fd"))
+        
+        before = open_fds()
+        with MemoryMonitor() as monitor:
+            monitor.get_memory_usage()
+            assert open_fds() == before + 1
+        assert open_fds() == before
+        
+        assert monitor.get_memory_usage(force=True) > 0
+        monitor.close()
+        monitor.close()
+        assert open_fds() == before
+        
+        MemoryMonitor().get_memory_usage()
+        gc.collect()
+        assert open_fds() == before
+    
+    def test_readings_are_cached(self):
+        """Test that back-to-back readings reuse one process query."""
+        monitor = MemoryMonitor()
+        with patch.object(monitor, "_read_rss", return_value=42) as read_rss:
+            assert monitor.get_memory_usage() == 42
+            assert monitor.check_memory_usage() == "normal"
+            assert read_rss.call_count == 1
+            
+            read_rss.return_value = 43
+            assert monitor.get_memory_usage(force=True) == 43
+            assert read_rss.call_count == 2
+    
+    def test_check_memory_usage_thresholds(self):
+        """Test the warning and critical thresholds."""
+        monitor = MemoryMonitor(warning_threshold_mb=1, critical_threshold_mb=2)
+        
+        for rss, status in [(512 * 1024, "normal"), (1536 * 1024, "warning"), (3 * 1024 * 1024, "critical")]:
+            with patch.object(monitor, "_read_rss", return_value=rss):
+                monitor.get_memory_usage(force=True)
+                assert monitor.check_memory_usage() == status
+    
+    def test_full_collections_are_throttled(self):
+        """Test that back-to-back cleanups run only one full collection."""
+        monitor = MemoryMonitor()
+        with patch("utils.memory_monitor.gc.collect", return_value=0) as collect:
+            monitor.force_cleanup()
+            monitor.force_cleanup()
+        
+        collect.assert_called_once_with(2)
+
+
+class TestCacheRegistry:
+    """Test clearing registered caches."""
+    
+    def test_optimize_clears_registered_caches(self, monkeypatch):
+        """Test that dicts and lru_cache functions registered are cleared."""
+        monkeypatch.setattr(memory_monitor, "_caches", [])
+        
+        plain = {"key": "value"}
+        
+        @functools.lru_cache(maxsize=None)
+        def cached(n):
+            return n * 2
+        
+        cached(1)
+        register_cache(plain)
+        register_cache(cached)
+        optimize_memory_usage()
+        
+        assert plain == {}
+        assert cached.cache_info().currsize == 0
+    
+    def test_collected_caches_are_skipped(self, monkeypatch):
+        """Test that a cache which was garbage collected is ignored."""
+        monkeypatch.setattr(memory_monitor, "_caches", [])
+        
+        @functools.lru_cache(maxsize=None)
+        def cached(n):
+            return n
+        
+        register_cache(cached)
+        del cached
+        gc.collect()
+        
+        optimize_memory_usage()
+    
+    def test_owning_modules_register_their_caches(self, tmp_path):
+        """Test that optimize_memory_usage clears the caches of the modules that own them."""
+        import issue_deduplicator
+        import llm
+        
+        issue_deduplicator.classify("E501", "Line too long")
+        source = tmp_path / "a.py"
+        source.write_text("x = 1\n")
+        llm._read_source(source)
+        
+        optimize_memory_usage()
+        
+        assert issue_deduplicator.classify.cache_info().currsize == 0
+        assert llm._read_source_cached.cache_info().currsize == 0
@@ -0,0 +1,135 @@
+"""
+Tests for web interface session storage.
+"""
+
+import os
+import shutil
+import time
+import pytest
+import session_store
+from session_store import (
+    create_upload_dir, delete_session, get_session, is_upload_dir, purge_expired_sessions, set_session
+)
+
+
+@pytest.fixture(autouse=True)
+def session_dir(tmp_path, monkeypatch):
+    """Keep sessions for each test in their own directory."""
+    monkeypatch.setenv("CODEFIXER_SESSION_DIR", str(tmp_path / "sessions"))
+    return tmp_path / "sessions"
+
+
+@pytest.fixture
+def upload_dir():
+    """An upload directory made the way the web interface makes them."""
+    path = create_upload_dir("test")
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def _age(session_id, seconds):
+    """Backdate a session's last write."""
+    path = session_store._session_file(session_id)
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+class TestSessionStore:
+    """Test storing, loading and expiring sessions."""
+    
+    def test_round_trip(self, upload_dir):
+        """Test that stored sessions load back unchanged."""
+        data = {"temp_dir": upload_dir, "repo_path": upload_dir, "issues": {"a.py": [{"row": 1, "code": "E1"}]}}
+        set_session("abc", data)
+        
+        assert get_session("abc") == data
+        assert get_session("missing") is None
+    
+    def test_session_id_cannot_escape_directory(self, session_dir):
+        """Test that hostile session ids still map inside the session directory."""
+        set_session("../../etc/passwd", {"x": 1})
+        
+        assert [p.parent for p in session_dir.iterdir()] == [session_dir]
+        assert get_session("../../etc/passwd") == {"x": 1}
+    
+    def test_non_string_keys_are_stringified(self):
+        """Test that integer keys round-trip as strings, as with json.dumps."""
+        set_session("abc", {"issues": {1: ["a"]}})
+        
+        assert get_session("abc") == {"issues": {"1": ["a"]}}
+    
+    def test_paths_are_stored_as_strings(self, tmp_path):
+        """Test that Path values are written as plain path strings."""
+        set_session("abc", {"languages": {"python": [tmp_path / "a.py"]}})
+        
+        assert get_session("abc") == {"languages": {"python": [str(tmp_path / "a.py")]}}
+    
+    def test_delete_returns_data(self, upload_dir):
+        """Test that deleting a session returns what it held."""
+        set_session("abc", {"temp_dir": upload_dir})
+        
+        assert delete_session("abc") == {"temp_dir": upload_dir}
+        assert get_session("abc") is None
+        assert delete_session("abc") is None
+    
+    def test_expired_sessions_are_not_returned(self):
+        """Test that sessions older than the TTL are treated as missing."""
+        set_session("old", {"x": 1})
+        _age("old", session_store.SESSION_TTL + 10)
+        
+        assert get_session("old") is None
+    
+    def test_purge_removes_expired_sessions_and_temp_dirs(self, upload_dir):
+        """Test that purging deletes expired sessions and their extracted files."""
+        set_session("old", {"temp_dir": upload_dir})
+        set_session("new", {"x": 1})
+        _age("old", session_store.SESSION_TTL + 10)
+        
+        assert purge_expired_sessions() == 1
+        assert not os.path.exists(upload_dir)
+        assert get_session("new") == {"x": 1}
+    
+    def test_purge_leaves_foreign_temp_dirs_alone(self, tmp_path):
+        """Test that purging never deletes a temp_dir the app did not create."""
+        victim = tmp_path / "victim"
+        victim.mkdir()
+        set_session("old", {"temp_dir": str(victim)})
+        _age("old", session_store.SESSION_TTL + 10)
+        
+        assert purge_expired_sessions() == 1
+        assert victim.exists()
+    
+    def test_sessions_pointing_outside_uploads_are_ignored(self, tmp_path, upload_dir):
+        """Test that planted sessions with foreign paths are not returned."""
+        set_session("foreign", {"temp_dir": str(tmp_path), "repo_path": str(tmp_path)})
+        set_session("escape", {"temp_dir": upload_dir, "repo_path": "/etc"})
+        set_session("ok", {"temp_dir": upload_dir, "repo_path": os.path.join(upload_dir, "repo")})
+        
+        assert get_session("foreign") is None
+        assert get_session("escape") is None
+        assert get_session("ok") is not None
+    
+    def test_upload_dirs_are_recognised(self, tmp_path, upload_dir):
+        """Test that only directories from create_upload_dir count as uploads."""
+        assert is_upload_dir(upload_dir)
+        assert not is_upload_dir(str(tmp_path))
+        assert not is_upload_dir(os.path.join(upload_dir, "nested"))
+
+
+class TestSessionDirectory:
+    """Test that the session directory is private to the current user."""
+    
+    def test_directory_is_created_private(self, session_dir):
+        """Test that a new session directory is only accessible to its owner."""
+        set_session("abc", {"x": 1})
+        
+        assert session_dir.stat().st_mode & 0o077 == 0
+    
+    @pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions only")
+    def test_shared_directory_is_refused(self, session_dir):
+        """Test that a group- or world-writable session directory is rejected."""
+        session_dir.mkdir()
+        session_dir.chmod(0o777)
+        
+        with pytest.raises(PermissionError):
+            set_session("abc", {"x": 1})
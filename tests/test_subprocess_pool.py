@@ -0,0 +1,121 @@
+"""
+Tests for subprocess helpers.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import pytest
+from utils.subprocess_pool import get_pool, run_subprocess_batch, run_subprocess_with_timeout, submit
+
+
+class TestRunSubprocess:
+    """Test running single subprocesses."""
+    
+    def test_captures_output(self):
+        """Test that stdout and the return code are captured."""
+        result = run_subprocess_with_timeout([sys.executable, "-c", "print('hi'); raise SystemExit(3)"])
+        
+        assert result.returncode == 3
+        assert result.stdout.strip() == "hi"
+    
+    @pytest.mark.skipif(not getattr(subprocess, "_USE_POSIX_SPAWN", False), reason="posix_spawn not used on this platform")
+    def test_uses_posix_spawn(self, monkeypatch):
+        """Test that commands are launched with posix_spawn rather than fork."""
+        spawned = []
+        posix_spawn = os.posix_spawn
+        
+        def record_spawn(path, *args, **kwargs):
+            spawned.append(path)
+            return posix_spawn(path, *args, **kwargs)
+        
+        monkeypatch.setattr(os, "posix_spawn", record_spawn)
+        result = run_subprocess_with_timeout([os.path.basename(sys.executable), "-c", "pass"])
+        
+        assert result.returncode == 0
+        assert spawned == [shutil.which(os.path.basename(sys.executable))]
+    
+    def test_command_not_found(self):
+        """Test that a missing executable yields a failed result."""
+        result = run_subprocess_with_timeout(["codefixer-no-such-command"])
+        
+        assert result.returncode == -1
+        assert "Command not found" in result.stderr
+    
+    def test_timeout(self):
+        """Test that a command exceeding the timeout yields a failed result."""
+        result = run_subprocess_with_timeout([sys.executable, "-c", "import time; time.sleep(30)"], timeout=1)
+        
+        assert result.returncode == -1
+        assert "timed out" in result.stderr
+    
+    def test_timeout_keeps_partial_output(self):
+        """Test that output written before the timeout is returned."""
+        script = "import sys, time; print('partial', flush=True); time.sleep(30)"
+        result = run_subprocess_with_timeout([sys.executable, "-c", script], timeout=1)
+        
+        assert result.returncode == -1
+        assert result.stdout.strip() == "partial"
+        assert "timed out" in result.stderr
+
+
+class TestSubprocessBatch:
+    """Test running subprocesses in parallel."""
+    
+    def test_results_keep_command_order(self):
+        """Test that results line up with the commands that produced them."""
+        commands = [[sys.executable, "-c", f"print({n})"] for n in range(5)]
+        results = run_subprocess_batch(commands, max_workers=3)
+        
+        assert [r.stdout.strip() for r in results] == ["0", "1", "2", "3", "4"]
+    
+    def test_failures_stay_in_place(self):
+        """Test that missing commands and timeouts fail only their own slot."""
+        commands = [
+            ["codefixer-no-such-command"],
+            [sys.executable, "-c", "import time; time.sleep(30)"],
+            [sys.executable, "-c", "print('ok')"],
+        ]
+        results = run_subprocess_batch(commands, timeout=1)
+        
+        assert [r.returncode for r in results] == [-1, -1, 0]
+        assert "Command not found" in results[0].stderr
+        assert "timed out" in results[1].stderr
+        assert results[2].stdout.strip() == "ok"
+    
+    def test_timeout_keeps_partial_output(self):
+        """Test that a timed-out batch command still returns what it printed."""
+        script = "import sys, time; print('partial', flush=True); time.sleep(30)"
+        commands = [[sys.executable, "-c", script], [sys.executable, "-c", "print('ok')"]]
+        results = run_subprocess_batch(commands, timeout=1)
+        
+        assert results[0].returncode == -1
+        assert results[0].stdout.strip() == "partial"
+        assert "timed out" in results[0].stderr
+        assert results[1].stdout.strip() == "ok"
+    
+    def test_timeout_escalates_to_kill(self):
+        """Test that a command ignoring SIGTERM is killed after the grace period."""
+        script = "import signal, time; signal.signal(signal.SIGTERM, signal.SIG_IGN); print('up', flush=True); time.sleep(30)"
+        commands = [[sys.executable, "-c", script], [sys.executable, "-c", "pass"]]
+        results = run_subprocess_batch(commands, timeout=1)
+        
+        assert results[0].returncode == -1
+        assert results[0].stdout.strip() == "up"
+    
+    def test_empty_batch(self):
+        """Test that an empty batch returns no results."""
+        assert run_subprocess_batch([]) == []
+
+
+class TestSharedPool:
+    """Test the shared thread pool."""
+    
+    def test_submit_returns_future(self):
+        """Test that submit runs the task on the shared pool."""
+        assert submit(sum, [1, 2, 3]).result(timeout=5) == 6
+    
+    def test_pool_is_shared(self):
+        """Test that the pool is created once and reused."""
+        assert get_pool() is get_pool()
@@ -0,0 +1,371 @@
+"""
+Tests for the web interface upload handling.
+"""
+
+import importlib
+import io
+import os
+import sys
+import tempfile
+import zipfile
+import pytest
+from unittest.mock import MagicMock, patch
+
+# flask comes with the server extra
+pytest.importorskip("flask")
+
+# linters/__init__.py imports classes that do not exist, so the real package
+# cannot be imported; web_interface is loaded with these modules mocked out.
+_LINTER_MODULES = (
+    "linters", "linters.python_linter", "linters.js_linter", "linters.html_linter",
+    "linters.css_linter", "linters.yaml_linter", "linters.go_linter",
+    "linters.rust_linter", "linters.java_linter", "linters.env_manager",
+)
+
+
+@pytest.fixture(scope="module")
+def web():
+    """Import web_interface with the linters package replaced by mocks."""
+    with patch.dict(sys.modules, {name: MagicMock() for name in _LINTER_MODULES}):
+        sys.modules.pop("web_interface", None)
+        yield importlib.import_module("web_interface")
+
+
+@pytest.fixture(autouse=True)
+def temp_root(tmp_path, monkeypatch):
+    """Keep sessions and upload directories for each test under tmp_path."""
+    monkeypatch.setenv("CODEFIXER_SESSION_DIR", str(tmp_path / "sessions"))
+    root = tmp_path / "tmp"
+    root.mkdir()
+    monkeypatch.setattr(tempfile, "tempdir", str(root))
+    return root
+
+
+@pytest.fixture
+def client(web):
+    """Flask test client for the web interface."""
+    return web.app.test_client()
+
+
+def _zip_bytes(members, symlinks=()):
+    """Build a ZIP archive in memory from a name -> bytes mapping."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        for name, data in members.items():
+            zip_file.writestr(name, data)
+        for name in symlinks:
+            info = zipfile.ZipInfo(name)
+            info.external_attr = 0o120777 << 16
+            zip_file.writestr(info, "/etc/passwd")
+    return buffer.getvalue()
+
+
+def _write_zip(path, members, symlinks=()):
+    """Write a ZIP archive built by _zip_bytes to path."""
+    path.write_bytes(_zip_bytes(members, symlinks))
+    return str(path)
+
+
+def _tree(root):
+    """Return {relative POSIX path: bytes} for every file under root."""
+    files = {}
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            with open(path, "rb") as f:
+                files[os.path.relpath(path, root).replace(os.sep, "/")] = f.read()
+    return files
+
+
+def _upload(client, data, session_id="test"):
+    """Post an archive to the upload endpoint."""
+    return client.post(
+        "/api/upload",
+        data={"file": (io.BytesIO(data), "repo.zip"), "session_id": session_id},
+        content_type="multipart/form-data",
+    )
+
+
+def _many_members(web):
+    """Enough non-empty members for extract_zip to use its thread pool."""
+    return {f"repo/mod{i}.py": f"x = {i}\n".encode() for i in range(web.PARALLEL_EXTRACT_MIN_FILES + 36)}
+
+
+def _failing_copy(copy_member, failing_name):
+    """Wrap _copy_member so copying one member fails as a full disk would."""
+    def copy(zip_ref, info, target, buffer):
+        if info.filename.endswith("/" + failing_name):
+            raise OSError("disk full")
+        copy_member(zip_ref, info, target, buffer)
+    return copy
+
+
+UNSAFE_NAMES = ["../evil.py", "src/../../evil.py", "/tmp/evil.py"]
+
+
+class TestSafeJoin:
+    """Test archive member names are kept inside the extraction root."""
+    
+    def test_nested_name(self, web, tmp_path):
+        """Test that a nested relative name joins under the root."""
+        root = os.path.realpath(tmp_path)
+        
+        assert web._safe_join(root, "src/app.py") == os.path.join(root, "src", "app.py")
+    
+    @pytest.mark.parametrize("name", UNSAFE_NAMES)
+    def test_rejects_escaping_names(self, web, tmp_path, name):
+        """Test that parent references and absolute paths are refused."""
+        with pytest.raises(web.UnsafeZipEntryError):
+            web._safe_join(os.path.realpath(tmp_path), name)
+
+
+class TestExtractZip:
+    """Test extracting uploaded archives."""
+    
+    def test_writes_exactly_the_members(self, web, tmp_path):
+        """Test that extraction produces the archive's files and nothing else."""
+        members = {
+            "repo/": b"",
+            "repo/main.py": b"print('hi')\n",
+            "repo/src/util.py": b"x = 1\n" * 1000,
+            "repo/empty.txt": b"",
+        }
+        zip_path = _write_zip(tmp_path / "repo.zip", members)
+        target = tmp_path / "out"
+        target.mkdir()
+        
+        web.extract_zip(zip_path, str(target))
+        
+        assert _tree(target) == {name: data for name, data in members.items() if not name.endswith("/")}
+    
+    @pytest.mark.parametrize("name", UNSAFE_NAMES)
+    def test_rejects_escaping_members(self, web, tmp_path, name):
+        """Test that a member outside the target directory is refused."""
+        zip_path = _write_zip(tmp_path / "repo.zip", {"ok.py": b"x = 1\n", name: b"evil\n"})
+        target = tmp_path / "out"
+        target.mkdir()
+        
+        with pytest.raises(web.UnsafeZipEntryError):
+            web.extract_zip(zip_path, str(target))
+        
+        assert not (tmp_path / "evil.py").exists()
+    
+    def test_rejects_symlink_members(self, web, tmp_path):
+        """Test that a symbolic link member is refused rather than written."""
+        zip_path = _write_zip(tmp_path / "repo.zip", {"ok.py": b"x = 1\n"}, symlinks=["link.py"])
+        target = tmp_path / "out"
+        target.mkdir()
+        
+        with pytest.raises(web.UnsafeZipEntryError):
+            web.extract_zip(zip_path, str(target))
+        
+        assert not (target / "link.py").exists()
+    
+    def test_parallel_extraction_writes_every_file(self, web, tmp_path):
+        """Test that archives large enough for the thread pool extract byte for byte."""
+        members = {
+            f"repo/pkg{i % 7}/mod{i}.py": os.urandom(1 + i * 997 % 50000)
+            for i in range(web.PARALLEL_EXTRACT_MIN_FILES + 36)
+        }
+        zip_path = _write_zip(tmp_path / "repo.zip", members)
+        target = tmp_path / "out"
+        target.mkdir()
+        
+        web.extract_zip(zip_path, str(target))
+        
+        assert _tree(target) == members
+    
+    def test_parallel_extraction_failure_is_raised(self, web, tmp_path):
+        """Test that a worker error stops extraction and reaches the caller."""
+        members = _many_members(web)
+        zip_path = _write_zip(tmp_path / "repo.zip", members)
+        target = tmp_path / "out"
+        target.mkdir()
+        
+        with patch.object(web, "_copy_member", side_effect=_failing_copy(web._copy_member, "mod50.py")):
+            with pytest.raises(OSError, match="disk full"):
+                web.extract_zip(zip_path, str(target))
+
+
+class TestSingletons:
+    """Test the process-wide linter singletons."""
+    
+    def test_memory_optimization_keeps_singletons(self, web):
+        """Test that clearing caches does not replace the environment manager or linters."""
+        from utils.memory_monitor import optimize_memory_usage
+        web._get_env_manager.cache_clear()
+        web._get_linter.cache_clear()
+        
+        try:
+            with patch.object(web, "EnvironmentManager", side_effect=object), \
+                 patch.object(web, "GoLinter", side_effect=lambda manager: object()):
+                manager = web._get_env_manager()
+                linter = web._get_linter(web.GoLinter)
+                
+                optimize_memory_usage()
+                
+                assert web._get_env_manager() is manager
+                assert web._get_linter(web.GoLinter) is linter
+        finally:
+            web._get_env_manager.cache_clear()
+            web._get_linter.cache_clear()
+
+
+class TestUpload:
+    """Test the upload endpoint."""
+    
+    def test_upload_stores_session(self, web, client):
+        """Test that a valid archive is extracted and recorded in the session."""
+        response = _upload(client, _zip_bytes({"repo/main.py": b"print('hi')\n"}))
+        
+        assert response.status_code == 200
+        session_data = web.get_session("test")
+        assert (web.Path(session_data["repo_path"]) / "main.py").read_bytes() == b"print('hi')\n"
+    
+    @pytest.mark.parametrize("name", UNSAFE_NAMES)
+    def test_unsafe_member_returns_400(self, web, client, temp_root, name):
+        """Test that a traversal member is rejected and nothing is kept."""
+        response = _upload(client, _zip_bytes({"main.py": b"x = 1\n", name: b"evil\n"}))
+        
+        assert response.status_code == 400
+        assert list(temp_root.iterdir()) == []
+        assert web.get_session("test") is None
+    
+    def test_symlink_member_returns_400(self, web, client, temp_root):
+        """Test that a symbolic link member is rejected and nothing is kept."""
+        response = _upload(client, _zip_bytes({"main.py": b"x = 1\n"}, symlinks=["link.py"]))
+        
+        assert response.status_code == 400
+        assert list(temp_root.iterdir()) == []
+        assert web.get_session("test") is None
+    
+    def test_failed_parallel_extraction_returns_error(self, web, client, temp_root):
+        """Test that a worker error fails the upload and removes the partial tree."""
+        data = _zip_bytes(_many_members(web))
+        
+        with patch.object(web, "_copy_member", side_effect=_failing_copy(web._copy_member, "mod50.py")):
+            response = _upload(client, data)
+        
+        assert response.status_code == 500
+        assert "disk full" in response.get_json()["error"]
+        assert list(temp_root.iterdir()) == []
+        assert web.get_session("test") is None
+
+
+class TestStreamFixesZip:
+    """Test the streamed fixes download."""
+    
+    def test_chunks_form_a_valid_archive(self, web, tmp_path):
+        """Test that the joined chunks open as a ZIP holding the fixed and original files."""
+        (tmp_path / "src").mkdir()
+        (tmp_path / "main.py").write_text("x=1\n")
+        (tmp_path / "src" / "util.py").write_text("y=2\n")
+        fixes = {"main.py": "x = 1\n", "src/util.py": "y = 2\n" * 500, "new.py": "z = 3\n"}
+        
+        chunks = list(web.stream_fixes_zip(tmp_path, fixes))
+        
+        with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as zip_file:
+            assert zip_file.testzip() is None
+            assert sorted(zip_file.namelist()) == sorted(
+                [f"fixed/{name}" for name in fixes] + ["original/main.py", "original/src/util.py"]
+            )
+            for name, content in fixes.items():
+                assert zip_file.read(f"fixed/{name}").decode() == content
+            assert zip_file.read("original/main.py") == b"x=1\n"
+            assert zip_file.read("original/src/util.py") == b"y=2\n"
+
+
+@pytest.fixture
+def uploaded_repo(web):
+    """A session whose upload holds two Python files, made as the upload endpoint makes them."""
+    temp_dir = web.create_upload_dir("test")
+    os.mkdir(os.path.join(temp_dir, web.CACHE_DIR_NAME))
+    repo_path = web.Path(temp_dir) / "repo"
+    (repo_path / ".git").mkdir(parents=True)
+    (repo_path / "main.py").write_text("x=1\n")
+    (repo_path / "util.py").write_text("y=2\n")
+    web.set_session("test", {"repo_path": str(repo_path), "temp_dir": temp_dir})
+    return repo_path
+
+
+def _lint_stub(files, repo_path, setup=True):
+    """Stand-in for run_python_linter reporting one issue per file."""
+    return {
+        str(file_path): [{"row": 1, "col": 2, "code": "E225", "text": "missing whitespace around operator"}]
+        for file_path in files
+    }
+
+
+class TestAnalyzeCache:
+    """Test that repeated analysis reuses cached languages and lint results."""
+    
+    def _analyze(self, client):
+        """Run an analysis of the test session and return its JSON summary."""
+        response = client.post("/api/analyze", json={"session_id": "test"})
+        assert response.status_code == 200
+        return response.get_json()
+    
+    def test_second_analyze_reuses_results(self, web, client, uploaded_repo):
+        """Test that an unchanged upload skips both the language walk and the linters."""
+        with patch.object(web, "run_python_linter", side_effect=_lint_stub) as mock_lint, \
+             patch.object(web, "detect_languages", side_effect=web.detect_languages) as mock_detect:
+            first = self._analyze(client)
+            first_issues = web.get_session("test")["issues"]
+            second = self._analyze(client)
+        
+        assert first == second
+        assert first["total_issues"] == 2
+        assert web.get_session("test")["issues"] == first_issues
+        mock_detect.assert_called_once()
+        mock_lint.assert_called_once()
+    
+    def test_analyze_classifies_each_issue_once(self, web, client, uploaded_repo):
+        """Test that prioritizing and filtering share one classification per issue."""
+        import issue_deduplicator
+        with patch.object(web, "run_python_linter", side_effect=_lint_stub), \
+             patch.object(issue_deduplicator, "classify", side_effect=issue_deduplicator.classify) as mock_classify:
+            result = self._analyze(client)
+        
+        assert result["total_issues"] == 2
+        assert mock_classify.call_count == 2
+    
+    def test_editing_a_file_relints_only_that_file(self, web, client, uploaded_repo):
+        """Test that a changed file is linted again while the other file's entry is reused."""
+        with patch.object(web, "run_python_linter", side_effect=_lint_stub) as mock_lint:
+            self._analyze(client)
+            
+            main_py = uploaded_repo / "main.py"
+            main_py.write_text("x = 1\n")
+            os.utime(main_py, ns=(1, 1))
+            result = self._analyze(client)
+        
+        assert mock_lint.call_count == 2
+        assert mock_lint.call_args.args[0] == [main_py]
+        assert result["total_issues"] == 2
+        assert sorted(web.get_session("test")["issues"]) == sorted([str(main_py), str(uploaded_repo / "util.py")])
+
+
+class TestFix:
+    """Test the fix endpoint."""
+    
+    @pytest.mark.parametrize("parallel", ["many", None, [2]])
+    def test_invalid_parallel_returns_400(self, web, client, parallel):
+        """Test that a non-integer parallel setting is rejected before any work."""
+        web.set_session("test", {"issues": {"main.py": []}})
+        
+        with patch.object(web, "generate_fixes") as mock_generate:
+            response = client.post("/api/fix", json={"session_id": "test", "parallel": parallel})
+        
+        assert response.status_code == 400
+        assert "parallel" in response.get_json()["error"]
+        mock_generate.assert_not_called()
+    
+    def test_parallel_is_capped(self, web, client):
+        """Test that a valid parallel setting is bounded by MAX_FIX_WORKERS."""
+        web.set_session("test", {"issues": {"main.py": []}})
+        
+        with patch.object(web, "generate_fixes", return_value={}) as mock_generate:
+            response = client.post("/api/fix", json={"session_id": "test", "parallel": "1000"})
+        
+        assert response.status_code == 200
+        assert 1 <= mock_generate.call_args.kwargs["max_workers"] <= web.MAX_FIX_WORKERS
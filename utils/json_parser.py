@@ -4,11 +4,53 @@ Optimized JSON parsing utilities for CodeFixer.
 
 import json
 import logging
-from typing import Any, Dict, List, Optional
+import re
+import sys
+from typing import Any, Dict, List, Optional, Tuple, Union
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# orjson is optional and parses large linter outputs faster. Its
+# JSONDecodeError subclasses json.JSONDecodeError, so handlers are shared.
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# Shared decoder for scanning concatenated objects with raw_decode
+_DECODER = json.JSONDecoder()
+
+# Text output patterns for each linter, compiled once. They run over the
+# whole output in MULTILINE mode, so whitespace is [^\S\n] to keep every
+# match on one line, and (?!#) skips comment lines.
+_PATTERNS = {
+    # flake8 format: file:line:col: code message
+    # Linter codes and positions are ASCII, so skip Unicode class lookups
+    "flake8": re.compile(r'^(?!#)(.+):(\d+):(\d+):[^\S\n]*(\w+)[^\S\n]+(.+)$', re.ASCII | re.MULTILINE),
+    # ESLint format: line:col error message (rule); the severity is not kept
+    "eslint": re.compile(r'^(?!#)[^\S\n]*(\d+):(\d+)[^\S\n]+(?:error|warning)[^\S\n]+(.+?)[^\S\n]+\((.+?)\)$', re.ASCII | re.MULTILINE),
+    # mypy format: file:line: error: message
+    "mypy": re.compile(r'^(?!#)(.+):(\d+):[^\S\n]*(error|warning):[^\S\n]*(.+)$', re.MULTILINE),
+    # Generic pattern
+    "_generic": re.compile(r'^(?!#)(.+):(\d+):(\d+):[^\S\n]*(.+)$', re.MULTILINE),
+}
+
+# Output size from which flake8 text is parsed with the findall fast path
+BULK_PARSE_MIN_CHARS = 64 * 1024
+
+def intern_code(code: Any) -> Any:
+    """
+    Intern a linter code as its issue is built.
+    
+    The same few codes repeat across thousands of issues, so interning them
+    here lets every later dict key, cache lookup and comparison use one
+    shared string. Codes that are not strings, such as a missing rule id,
+    are returned unchanged.
+    """
+    return sys.intern(code) if type(code) is str else code
+
 def parse_json_safe(json_str: str, fallback_parser: Optional[callable] = None) -> List[Dict[str, Any]]:
     """
     Safely parse JSON with fallback to text parsing.
@@ -26,11 +68,11 @@ def parse_json_safe(json_str: str, fallback_parser: Optional[callable] = None) -
     try:
         # Try to parse as JSON array
         if json_str.strip().startswith('['):
-            return json.loads(json_str)
+            return _loads(json_str)
         
         # Try to parse as JSON object
         if json_str.strip().startswith('{'):
-            obj = json.loads(json_str)
+            obj = _loads(json_str)
             return [obj] if isinstance(obj, dict) else []
         
         # Try to parse as newline-delimited JSON
@@ -45,28 +87,40 @@ def parse_json_safe(json_str: str, fallback_parser: Optional[callable] = None) -
         # Try to extract JSON objects from mixed content
         return extract_json_objects(json_str)
 
-def parse_ndjson(json_str: str) -> List[Dict[str, Any]]:
+def parse_ndjson(json_str: Union[str, bytes]) -> List[Dict[str, Any]]:
     """
     Parse newline-delimited JSON.
     
+    Lines are sliced one at a time rather than splitting the whole buffer, so
+    a large stream is not held twice in memory. Raw subprocess output can be
+    passed as bytes to skip decoding it first.
+    
     Args:
-        json_str: Newline-delimited JSON string
+        json_str: Newline-delimited JSON string or bytes
         
     Returns:
         List of parsed objects
     """
     objects = []
+    newline = b'\n' if isinstance(json_str, bytes) else '\n'
+    pos = 0
+    end_of_input = len(json_str)
     
-    for line in json_str.strip().split('\n'):
-        line = line.strip()
+    while pos < end_of_input:
+        end = json_str.find(newline, pos)
+        if end < 0:
+            end = end_of_input
+        line = json_str[pos:end].strip()
+        pos = end + 1
+        
         if not line:
             continue
         
         try:
-            obj = json.loads(line)
+            obj = _loads(line)
             if isinstance(obj, dict):
                 objects.append(obj)
-        except json.JSONDecodeError:
+        except (json.JSONDecodeError, UnicodeDecodeError):
             continue
     
     return objects
@@ -82,21 +136,21 @@ def extract_json_objects(text: str) -> List[Dict[str, Any]]:
         List of extracted JSON objects
     """
     objects = []
+    raw_decode = _DECODER.raw_decode
     
-    # Find JSON-like patterns
-    import re
-    
-    # Pattern for JSON objects
-    json_pattern = r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}'
-    
-    matches = re.finditer(json_pattern, text)
-    for match in matches:
+    # Let the C decoder find where each object ends instead of matching
+    # balanced braces with a regex, which only handled one nesting level
+    idx = text.find('{')
+    while idx != -1:
         try:
-            obj = json.loads(match.group())
-            if isinstance(obj, dict):
-                objects.append(obj)
+            obj, end = raw_decode(text, idx)
         except json.JSONDecodeError:
+            idx = text.find('{', idx + 1)
             continue
+        
+        if isinstance(obj, dict):
+            objects.append(obj)
+        idx = text.find('{', end)
     
     return objects
 
@@ -117,16 +171,7 @@ def parse_linter_output(output: str, file_path: Path, linter_type: str) -> List[
     
     # Try JSON parsing first
     try:
-        if linter_type == "flake8":
-            return parse_flake8_json(output, file_path)
-        elif linter_type == "eslint":
-            return parse_eslint_json(output, file_path)
-        elif linter_type == "mypy":
-            return parse_mypy_json(output, file_path)
-        else:
-            # Generic JSON parsing
-            json_data = parse_json_safe(output)
-            return convert_generic_json(json_data, file_path)
+        return _JSON_PARSERS.get(linter_type, _parse_generic_json)(output, file_path)
     except Exception as e:
         logger.debug(f"JSON parsing failed for {linter_type}: {e}")
         # Fallback to text parsing
@@ -135,15 +180,16 @@ def parse_linter_output(output: str, file_path: Path, linter_type: str) -> List[
 def parse_flake8_json(output: str, file_path: Path) -> List[Dict[str, Any]]:
     """Parse flake8 JSON output."""
     try:
-        data = json.loads(output)
+        data = _loads(output)
         issues = []
+        path_str = str(file_path)
         
         for issue in data:
             issues.append({
-                "path": str(file_path),
+                "path": path_str,
                 "row": issue.get("line_number", 1),
                 "col": issue.get("column_number", 1),
-                "code": issue.get("code", "unknown"),
+                "code": intern_code(issue.get("code", "unknown")),
                 "text": issue.get("text", "")
             })
         
@@ -154,8 +200,9 @@ def parse_flake8_json(output: str, file_path: Path) -> List[Dict[str, Any]]:
 def parse_eslint_json(output: str, file_path: Path) -> List[Dict[str, Any]]:
     """Parse ESLint JSON output."""
     try:
-        data = json.loads(output)
+        data = _loads(output)
         issues = []
+        path_str = str(file_path)
         
         # ESLint can return array or object
         if isinstance(data, list):
@@ -170,10 +217,10 @@ def parse_eslint_json(output: str, file_path: Path) -> List[Dict[str, Any]]:
             messages = file_data.get("messages", [])
             for message in messages:
                 issues.append({
-                    "path": str(file_path),
+                    "path": path_str,
                     "row": message.get("line", 1),
                     "col": message.get("column", 1),
-                    "code": message.get("ruleId", "unknown"),
+                    "code": intern_code(message.get("ruleId", "unknown")),
                     "text": message.get("message", "")
                 })
         
@@ -184,8 +231,9 @@ def parse_eslint_json(output: str, file_path: Path) -> List[Dict[str, Any]]:
 def parse_mypy_json(output: str, file_path: Path) -> List[Dict[str, Any]]:
     """Parse mypy JSON output."""
     try:
-        data = json.loads(output)
+        data = _loads(output)
         issues = []
+        path_str = str(file_path)
         
         # mypy returns a list of file results
         for file_result in data:
@@ -193,13 +241,13 @@ def parse_mypy_json(output: str, file_path: Path) -> List[Dict[str, Any]]:
                 continue
             
             result_path = file_result.get("path", "")
-            if result_path != str(file_path):
+            if result_path != path_str:
                 continue
             
             messages = file_result.get("messages", [])
             for message in messages:
                 issues.append({
-                    "path": str(file_path),
+                    "path": path_str,
                     "row": message.get("line", 1),
                     "col": message.get("column", 1),
                     "code": "mypy",
@@ -210,85 +258,116 @@ def parse_mypy_json(output: str, file_path: Path) -> List[Dict[str, Any]]:
     except (json.JSONDecodeError, TypeError):
         return []
 
+def _parse_generic_json(output: str, file_path: Path) -> List[Dict[str, Any]]:
+    """Parse JSON output from a linter without a dedicated parser."""
+    return convert_generic_json(parse_json_safe(output), file_path)
+
+# JSON parser for each linter type; others use _parse_generic_json
+_JSON_PARSERS = {
+    "flake8": parse_flake8_json,
+    "eslint": parse_eslint_json,
+    "mypy": parse_mypy_json,
+}
+
+def _flake8_fields(match: re.Match) -> Tuple[int, int, str, str]:
+    """Extract row, column, code and message from a flake8 line."""
+    row, col, code, message = match.group(2, 3, 4, 5)
+    return int(row), int(col), sys.intern(code), message.strip()
+
+def _eslint_fields(match: re.Match) -> Tuple[int, int, str, str]:
+    """Extract row, column, code and message from an ESLint line."""
+    row, col, message, code = match.group(1, 2, 3, 4)
+    return int(row), int(col), sys.intern(code), message.strip()
+
+def _mypy_fields(match: re.Match) -> Tuple[int, int, str, str]:
+    """Extract row and message from a mypy line, which has no column."""
+    row, message = match.group(2, 4)
+    return int(row), 1, "mypy", message.strip()
+
+def _generic_fields(match: re.Match) -> Tuple[int, int, str, str]:
+    """Extract row, column and message from a generic file:line:col: line."""
+    row, col, message = match.group(2, 3, 4)
+    return int(row), int(col), "unknown", message.strip()
+
+# Text pattern and field extractor for each linter type
+_TEXT_PARSERS = {
+    "flake8": (_PATTERNS["flake8"], _flake8_fields),
+    "eslint": (_PATTERNS["eslint"], _eslint_fields),
+    "mypy": (_PATTERNS["mypy"], _mypy_fields),
+}
+_GENERIC_TEXT_PARSER = (_PATTERNS["_generic"], _generic_fields)
+
 def parse_linter_text(output: str, file_path: Path, linter_type: str) -> List[Dict[str, Any]]:
     """Parse linter text output as fallback."""
-    import re
+    if linter_type == "flake8" and len(output) >= BULK_PARSE_MIN_CHARS:
+        return _parse_flake8_bulk(output, str(file_path))
     
     issues = []
+    pattern, fields = _TEXT_PARSERS.get(linter_type, _GENERIC_TEXT_PARSER)
     
-    if linter_type == "flake8":
-        # flake8 format: file:line:col: code message
-        pattern = r'^(.+):(\d+):(\d+):\s*(\w+)\s+(.+)$'
-    elif linter_type == "eslint":
-        # ESLint format: line:col error message (rule)
-        pattern = r'^\s*(\d+):(\d+)\s+(error|warning)\s+(.+?)\s+\((.+?)\)$'
-    elif linter_type == "mypy":
-        # mypy format: file:line: error: message
-        pattern = r'^(.+):(\d+):\s*(error|warning):\s*(.+)$'
-    else:
-        # Generic pattern
-        pattern = r'^(.+):(\d+):(\d+):\s*(.+)$'
+    # Bind per-call constants once so the loop body only does local loads
+    append = issues.append
+    path = str(file_path)
     
-    for line in output.strip().split('\n'):
-        if not line or line.startswith('#'):
+    for match in pattern.finditer(output):
+        try:
+            line_num, col_num, code, message = fields(match)
+            
+            append({
+                "path": path,
+                "row": line_num,
+                "col": col_num,
+                "code": code,
+                "text": message
+            })
+        except (ValueError, IndexError):
             continue
-        
-        match = re.match(pattern, line)
-        if match:
-            try:
-                if linter_type == "flake8":
-                    line_num = int(match.group(2))
-                    col_num = int(match.group(3))
-                    code = match.group(4)
-                    message = match.group(5).strip()
-                elif linter_type == "eslint":
-                    line_num = int(match.group(1))
-                    col_num = int(match.group(2))
-                    code = match.group(5)
-                    message = match.group(4).strip()
-                elif linter_type == "mypy":
-                    line_num = int(match.group(2))
-                    col_num = 1  # mypy doesn't provide column
-                    code = "mypy"
-                    message = match.group(4).strip()
-                else:
-                    line_num = int(match.group(2))
-                    col_num = int(match.group(3))
-                    code = "unknown"
-                    message = match.group(4).strip()
-                
-                issues.append({
-                    "path": str(file_path),
-                    "row": line_num,
-                    "col": col_num,
-                    "code": code,
-                    "text": message
-                })
-            except (ValueError, IndexError):
-                continue
     
     return issues
 
+def _parse_flake8_bulk(output: str, path: str) -> List[Dict[str, Any]]:
+    """
+    Parse large flake8 text output in one pass.
+    
+    findall returns plain tuples from C without building a match object per
+    line, and the comprehension builds the issue dicts without a Python-level
+    branch per line.
+    """
+    return [
+        {"path": path, "row": int(row), "col": int(col), "code": sys.intern(code), "text": text.strip()}
+        for _, row, col, code, text in _PATTERNS["flake8"].findall(output)
+    ]
+
+# Field names used by different linters for each issue attribute, in order
+_ROW_KEYS = ("line", "row", "line_number")
+_COL_KEYS = ("column", "col", "column_number")
+_CODE_KEYS = ("code", "rule", "ruleId")
+_TEXT_KEYS = ("message", "text")
+
+def _first_field(item: Dict[str, Any], keys: tuple, default: Any) -> Any:
+    """Return the first of keys present in item with a non-None value."""
+    for key in keys:
+        value = item.get(key)
+        if value is not None:
+            return value
+    return default
+
 def convert_generic_json(json_data: List[Dict[str, Any]], file_path: Path) -> List[Dict[str, Any]]:
     """Convert generic JSON data to standard issue format."""
     issues = []
+    path_str = str(file_path)
     
     for item in json_data:
         if not isinstance(item, dict):
             continue
         
         # Try to extract common fields
-        row = item.get("line", item.get("row", item.get("line_number"), 1))
-        col = item.get("column", item.get("col", item.get("column_number"), 1))
-        code = item.get("code", item.get("rule", item.get("ruleId"), "unknown"))
-        text = item.get("message", item.get("text", ""))
-        
         issues.append({
-            "path": str(file_path),
-            "row": row,
-            "col": col,
-            "code": code,
-            "text": text
+            "path": path_str,
+            "row": _first_field(item, _ROW_KEYS, 1),
+            "col": _first_field(item, _COL_KEYS, 1),
+            "code": intern_code(_first_field(item, _CODE_KEYS, "unknown")),
+            "text": _first_field(item, _TEXT_KEYS, "")
         })
     
     return issues 
\ No newline at end of file
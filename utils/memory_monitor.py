@@ -2,29 +2,122 @@
 Memory monitoring and optimization utilities for CodeFixer.
 """
 
-import psutil
 import gc
 import logging
-from typing import Optional, Callable
+import os
+import sys
+import time
+import weakref
+from typing import Any, Callable, List, Optional
 from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
 
+# Seconds a memory reading is reused before the process is queried again
+USAGE_TTL = 0.1
+
+# Minimum seconds between full garbage collections from force_cleanup
+FULL_GC_INTERVAL = 5.0
+
+# /proc/self/statm reports sizes in pages
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
 class MemoryMonitor:
     """Monitor and manage memory usage."""
     
     def __init__(self, warning_threshold_mb: int = 500, critical_threshold_mb: int = 1000):
         self.warning_threshold = warning_threshold_mb * 1024 * 1024  # Convert to bytes
         self.critical_threshold = critical_threshold_mb * 1024 * 1024
-        self.process = psutil.Process()
+        self._process = None
+        self._last_rss = 0
+        self._last_read = float("-inf")
+        self._statm_fd = None
+        self._statm_pid = None
+        self._last_full_gc = float("-inf")
+    
+    def close(self) -> None:
+        """Close the /proc/self/statm descriptor; a later reading reopens it."""
+        fd = getattr(self, "_statm_fd", None)
+        if fd is not None:
+            self._statm_fd = None
+            self._statm_pid = None
+            os.close(fd)
+    
+    def __enter__(self) -> "MemoryMonitor":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
     
-    def get_memory_usage(self) -> int:
-        """Get current memory usage in bytes."""
+    def __del__(self):
         try:
+            self.close()
+        except Exception:
+            # The descriptor may already be gone at interpreter shutdown
+            pass
+    
+    @property
+    def process(self):
+        """
+        The psutil handle for this process, created on first use.
+        
+        psutil is imported here rather than at module level, so modules can
+        register caches without it. It is a dependency on every platform but
+        Linux; there it is only needed if /proc/self/statm cannot be opened,
+        and without it get_memory_usage logs a warning and reports 0.
+        """
+        if self._process is None:
+            import psutil
+            self._process = psutil.Process()
+        return self._process
+    
+    def _read_rss(self) -> int:
+        """
+        Read the resident set size of this process in bytes.
+        
+        On Linux the second field of /proc/self/statm is read with pread on a
+        descriptor kept open between calls; psutil parses the much larger
+        status file. Other platforms use psutil.
+        """
+        if sys.platform != "linux":
             return self.process.memory_info().rss
+        
+        # /proc/self is resolved at open time, so a forked child must reopen
+        pid = os.getpid()
+        if self._statm_pid != pid:
+            if self._statm_fd is not None:
+                os.close(self._statm_fd)
+                self._statm_fd = None
+            try:
+                self._statm_fd = os.open("/proc/self/statm", os.O_RDONLY)
+            except OSError:
+                return self.process.memory_info().rss
+            self._statm_pid = pid
+        
+        return int(os.pread(self._statm_fd, 64, 0).split()[1]) * _PAGE_SIZE
+    
+    def get_memory_usage(self, force: bool = False) -> int:
+        """
+        Get current memory usage in bytes.
+        
+        Readings are reused for USAGE_TTL seconds, since a status check, a log
+        line and a monitor_memory enter or exit often ask back to back.
+        
+        Args:
+            force: Read the current value even if a recent one is cached
+        """
+        now = time.monotonic()
+        if not force and now - self._last_read < USAGE_TTL:
+            return self._last_rss
+        
+        try:
+            self._last_rss = self._read_rss()
         except Exception as e:
             logger.warning(f"Failed to get memory usage: {e}")
             return 0
+        
+        self._last_read = now
+        return self._last_rss
     
     def get_memory_usage_mb(self) -> float:
         """Get current memory usage in MB."""
@@ -55,14 +148,27 @@ class MemoryMonitor:
             logger.warning("Memory usage is critical, consider cleanup")
     
     def force_cleanup(self):
-        """Force garbage collection and memory cleanup."""
+        """
+        Force garbage collection and memory cleanup.
+        
+        Full collections walk the whole heap, so they run at most once every
+        FULL_GC_INTERVAL seconds; generations 0 and 1 are collected
+        automatically in between.
+        """
+        now = time.monotonic()
+        if now - self._last_full_gc < FULL_GC_INTERVAL:
+            logger.debug("Skipping memory cleanup, last full collection was too recent")
+            return
+        self._last_full_gc = now
+        
         logger.info("Forcing memory cleanup...")
         
         # Force garbage collection
-        collected = gc.collect()
+        collected = gc.collect(2)
         logger.info(f"Garbage collection freed {collected} objects")
         
-        # Log memory after cleanup
+        # Log memory after cleanup, refreshing the cached reading first
+        self.get_memory_usage(force=True)
         self.log_memory_usage("after cleanup")
     
     @contextmanager
@@ -89,6 +195,26 @@ class MemoryMonitor:
 # Global instance
 memory_monitor = MemoryMonitor()
 
+# References to caches cleared by optimize_memory_usage
+_caches: List[Callable[[], Any]] = []
+
+def register_cache(cache: Any) -> None:
+    """
+    Register a module-level cache to be cleared by optimize_memory_usage.
+    
+    Modules that own a data cache register it once at import time. Process
+    singletons cached with lru_cache must not be registered, as clearing
+    them would build a second instance next to the first.
+    
+    Args:
+        cache: A dict-like object with clear(), or an lru_cache-wrapped function
+    """
+    try:
+        _caches.append(weakref.ref(cache))
+    except TypeError:
+        # Plain dicts cannot be weakly referenced; they live at module scope anyway
+        _caches.append(lambda: cache)
+
 def optimize_memory_usage():
     """Optimize memory usage by cleaning up caches and forcing GC."""
     logger.info("Optimizing memory usage...")
@@ -96,13 +222,12 @@ def optimize_memory_usage():
     # Force garbage collection
     gc.collect()
     
-    # Clear any module-level caches
-    import sys
-    for module_name in list(sys.modules.keys()):
-        if module_name.startswith('codefixer') or module_name.startswith('linters'):
-            module = sys.modules[module_name]
-            if hasattr(module, '_cache'):
-                module._cache.clear()
+    # Clear the caches modules registered instead of scanning sys.modules
+    for ref in _caches:
+        cache = ref()
+        if cache is not None:
+            clear = getattr(cache, "cache_clear", None) or cache.clear
+            clear()
     
     # Log memory after optimization
     memory_monitor.log_memory_usage("after optimization")
@@ -2,69 +2,44 @@
 Subprocess pool for efficient subprocess management.
 """
 
+import asyncio
+import functools
+import os
+import shutil
 import subprocess
-import threading
-import queue
-import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import List, Dict, Any, Callable, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
-class SubprocessPool:
-    """Pool for managing subprocess execution with timeout and retry."""
-    
-    def __init__(self, max_workers: int = 4, timeout: int = 30):
-        self.max_workers = max_workers
-        self.timeout = timeout
-        self._queue = queue.Queue()
-        self._workers = []
-        self._stop_event = threading.Event()
-        self._start_workers()
-    
-    def _start_workers(self):
-        """Start worker threads."""
-        for i in range(self.max_workers):
-            worker = threading.Thread(target=self._worker, daemon=True)
-            worker.start()
-            self._workers.append(worker)
-    
-    def _worker(self):
-        """Worker thread function."""
-        while not self._stop_event.is_set():
-            try:
-                task = self._queue.get(timeout=1)
-                if task is None:
-                    break
-                
-                func, args, kwargs, result_queue = task
-                try:
-                    result = func(*args, **kwargs)
-                    result_queue.put(('success', result))
-                except Exception as e:
-                    result_queue.put(('error', e))
-                finally:
-                    self._queue.task_done()
-            except queue.Empty:
-                continue
-    
-    def submit(self, func: Callable, *args, **kwargs) -> queue.Queue:
-        """Submit a task to the pool."""
-        result_queue = queue.Queue()
-        self._queue.put((func, args, kwargs, result_queue))
-        return result_queue
+# Seconds a timed-out command gets to exit after SIGTERM before SIGKILL
+TERMINATE_GRACE = 2
+
+@functools.lru_cache(maxsize=1)
+def get_pool() -> ThreadPoolExecutor:
+    """Return the shared subprocess thread pool, creating it on first use."""
+    return ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="codefixer-subprocess")
+
+def submit(func: Callable, *args, **kwargs) -> Future:
+    """Submit a task to the shared pool."""
+    return get_pool().submit(func, *args, **kwargs)
+
+def _spawn_kwargs(cmd: List[str]) -> Dict[str, Any]:
+    """
+    Return Popen keyword arguments that let subprocess use posix_spawn.
     
-    def shutdown(self, wait: bool = True):
-        """Shutdown the pool."""
-        self._stop_event.set()
-        
-        # Send None to all workers to stop them
-        for _ in self._workers:
-            self._queue.put(None)
-        
-        if wait:
-            for worker in self._workers:
-                worker.join()
+    CPython only takes the posix_spawn path, which skips copying the
+    parent's page tables, when the executable is given with a directory and
+    close_fds is off. Our descriptors are non-inheritable (PEP 446), so not
+    closing them leaks nothing. Callers must not add preexec_fn, cwd,
+    start_new_session or process_group, which force fork again.
+    """
+    kwargs: Dict[str, Any] = {"close_fds": False}
+    executable = shutil.which(cmd[0]) if cmd else None
+    if executable:
+        kwargs["executable"] = executable
+    return kwargs
 
 def run_subprocess_with_timeout(cmd: List[str], timeout: int = 30, 
                                capture_output: bool = True, 
@@ -81,20 +56,14 @@ def run_subprocess_with_timeout(cmd: List[str], timeout: int = 30,
     Returns:
         CompletedProcess result
     """
+    pipe = subprocess.PIPE if capture_output else None
     try:
-        result = subprocess.run(
+        proc = subprocess.Popen(
             cmd,
-            capture_output=capture_output,
+            stdout=pipe,
+            stderr=pipe,
             text=text,
-            timeout=timeout,
-            check=False  # Don't raise on non-zero exit codes
-        )
-        return result
-    except subprocess.TimeoutExpired:
-        logger.warning(f"Subprocess timed out after {timeout}s: {' '.join(cmd)}")
-        # Return a mock result for timeout
-        return subprocess.CompletedProcess(
-            cmd, -1, "", f"Command timed out after {timeout} seconds"
+            **_spawn_kwargs(cmd)
         )
     except FileNotFoundError:
         logger.error(f"Command not found: {cmd[0]}")
@@ -106,6 +75,112 @@ def run_subprocess_with_timeout(cmd: List[str], timeout: int = 30,
         return subprocess.CompletedProcess(
             cmd, -1, "", str(e)
         )
+    
+    try:
+        stdout, stderr = proc.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        # Ask politely first so linters can flush the issues found so far
+        proc.terminate()
+        try:
+            stdout, stderr = proc.communicate(timeout=TERMINATE_GRACE)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            stdout, stderr = proc.communicate()
+        
+        logger.warning(f"Subprocess timed out after {timeout}s: {' '.join(cmd)}")
+        message = f"Command timed out after {timeout} seconds"
+        if not text:
+            message = message.encode()
+        return subprocess.CompletedProcess(
+            cmd, -1, stdout, stderr + message if stderr else message
+        )
+    except Exception as e:
+        proc.kill()
+        proc.wait()
+        logger.error(f"Subprocess error: {e}")
+        return subprocess.CompletedProcess(
+            cmd, -1, "", str(e)
+        )
+    
+    return subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+
+async def _drain(stream: asyncio.StreamReader, buffer: bytearray) -> None:
+    """Append everything read from a stream to buffer until EOF."""
+    while True:
+        chunk = await stream.read(65536)
+        if not chunk:
+            return
+        buffer += chunk
+
+def _signal(send: Callable[[], None]) -> None:
+    """Send a signal to a child that may already have exited."""
+    try:
+        send()
+    except ProcessLookupError:
+        pass
+
+async def _run_one(cmd: List[str], timeout: int,
+                   semaphore: asyncio.Semaphore) -> subprocess.CompletedProcess:
+    """Run one command of a batch on the event loop."""
+    async with semaphore:
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                **_spawn_kwargs(cmd)
+            )
+        except FileNotFoundError:
+            logger.error(f"Command not found: {cmd[0]}")
+            return subprocess.CompletedProcess(
+                cmd, -1, "", f"Command not found: {cmd[0]}"
+            )
+        except Exception as e:
+            logger.error(f"Subprocess error: {e}")
+            return subprocess.CompletedProcess(cmd, -1, "", str(e))
+        
+        # Read both pipes into buffers as data arrives, so whatever a command
+        # printed before timing out is still there to return
+        stdout, stderr = bytearray(), bytearray()
+        readers = asyncio.gather(_drain(proc.stdout, stdout), _drain(proc.stderr, stderr))
+        try:
+            await asyncio.wait_for(proc.wait(), timeout)
+        except asyncio.TimeoutError:
+            # Ask politely first so linters can flush the issues found so far
+            _signal(proc.terminate)
+            try:
+                await asyncio.wait_for(proc.wait(), TERMINATE_GRACE)
+            except asyncio.TimeoutError:
+                _signal(proc.kill)
+                await proc.wait()
+            
+            # A grandchild may still hold the pipes open; don't wait on it forever
+            try:
+                await asyncio.wait_for(readers, TERMINATE_GRACE)
+            except asyncio.TimeoutError:
+                pass
+            
+            logger.warning(f"Subprocess timed out after {timeout}s: {' '.join(cmd)}")
+            return subprocess.CompletedProcess(
+                cmd,
+                -1,
+                stdout.decode(errors="replace"),
+                stderr.decode(errors="replace") + f"Command timed out after {timeout} seconds"
+            )
+        
+        await readers
+        return subprocess.CompletedProcess(
+            cmd,
+            proc.returncode,
+            stdout.decode(errors="replace"),
+            stderr.decode(errors="replace")
+        )
+
+async def _run_all(commands: List[List[str]], max_workers: int,
+                   timeout: int) -> List[subprocess.CompletedProcess]:
+    """Run a batch of commands with at most max_workers at a time."""
+    semaphore = asyncio.Semaphore(max_workers)
+    return await asyncio.gather(*(_run_one(cmd, timeout, semaphore) for cmd in commands))
 
 def run_subprocess_batch(commands: List[List[str]], 
                         max_workers: int = 4,
@@ -127,30 +202,5 @@ def run_subprocess_batch(commands: List[List[str]],
     if len(commands) == 1:
         return [run_subprocess_with_timeout(commands[0], timeout)]
     
-    # Use ThreadPoolExecutor for I/O bound subprocess operations
-    from concurrent.futures import ThreadPoolExecutor, as_completed
-    
-    results = [None] * len(commands)
-    
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all commands
-        future_to_index = {
-            executor.submit(run_subprocess_with_timeout, cmd, timeout): i 
-            for i, cmd in enumerate(commands)
-        }
-        
-        # Collect results
-        for future in as_completed(future_to_index):
-            index = future_to_index[future]
-            try:
-                results[index] = future.result()
-            except Exception as e:
-                logger.error(f"Error in subprocess batch: {e}")
-                results[index] = subprocess.CompletedProcess(
-                    commands[index], -1, "", str(e)
-                )
-    
-    return results
-
-# Global subprocess pool
-subprocess_pool = SubprocessPool() 
\ No newline at end of file
+    # One event loop multiplexes every child's pipes instead of a thread per command
+    return asyncio.run(_run_all(commands, max_workers, timeout))
@@ -4,13 +4,19 @@ Web interface for CodeFixer.
 
 import os
 import json
+import functools
+import logging
 import tempfile
 from pathlib import Path
-from typing import Dict, Any, List
-from flask import Flask, render_template, request, jsonify, send_file
+from typing import Dict, Any, List, Optional
+from flask import Flask, Response, render_template, request, jsonify
 from werkzeug.utils import secure_filename
 import zipfile
 import shutil
+import stat
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from languages import detect_languages
 from linters.python_linter import run_python_linter
@@ -22,13 +28,77 @@ from linters.go_linter import GoLinter
 from linters.rust_linter import RustLinter
 from linters.java_linter import JavaLinter
 from linters.env_manager import EnvironmentManager
-from llm import generate_fix, list_available_models, detect_llm_runner
-from issue_deduplicator import deduplicate_issues, prioritize_issues, filter_issues_by_severity
+from llm import generate_fixes, list_available_models, detect_llm_runner
+from issue_deduplicator import deduplicate_issues, prioritize_issues_annotated, filter_issues_by_severity
+from session_store import get_session, set_session, delete_session, purge_expired_sessions, create_upload_dir, dumps_json, loads_json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
+
+try:
+    from flask.json.provider import DefaultJSONProvider
+except ImportError:  # Flask < 2.2 has no pluggable JSON provider
+    DefaultJSONProvider = None
+
+logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 app.config['MAX_CONTENT_LENGTH'] = 100 * 1024 * 1024  # 100MB max file size
 app.config['UPLOAD_FOLDER'] = tempfile.mkdtemp()
 
+if orjson is not None and DefaultJSONProvider is not None:
+    class ORJSONProvider(DefaultJSONProvider):
+        """JSON provider that encodes responses and decodes request bodies with orjson."""
+        
+        def dumps(self, obj: Any, **kwargs: Any) -> str:
+            return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode()
+        
+        def loads(self, s: Any, **kwargs: Any) -> Any:
+            return orjson.loads(s)
+    
+    app.json = ORJSONProvider(app)
+
+# Compress JSON responses. COMPRESS_BR_LEVEL 4 gets Brotli close to gzip -9
+# at a fraction of the CPU; gzip (COMPRESS_LEVEL) keeps its default of 6 for
+# clients without Brotli. The fixes ZIP is already deflated and is not in the
+# MIME list.
+if Compress is not None:
+    app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+    app.config['COMPRESS_MIN_SIZE'] = 1024
+    app.config['COMPRESS_BR_LEVEL'] = 4
+    Compress(app)
+
+@functools.lru_cache(maxsize=1)
+def _get_env_manager() -> EnvironmentManager:
+    """
+    Return the environment manager shared across requests, creating it on first use.
+    
+    EnvironmentManager scans old environments and starts its cleanup thread on
+    construction, so it is not built at import time.
+    """
+    return EnvironmentManager()
+
+@functools.lru_cache(maxsize=None)
+def _get_linter(linter_class: type) -> Any:
+    """Return the shared instance of a Go, Rust or Java linter; they hold no per-request state."""
+    return linter_class(_get_env_manager())
+
+# Per-upload cache directory inside temp_dir; hidden, so language detection skips it
+CACHE_DIR_NAME = '.codefixer_cache'
+
+# Upper bound on concurrent LLM requests per /api/fix call
+MAX_FIX_WORKERS = 8
+
+# Extensions that mark a directory as holding source code
+_SRC_SUFFIXES = frozenset({'.py', '.js', '.ts', '.java', '.go', '.rs'})
+
 @app.route('/')
 def index():
     """Main page."""
@@ -48,31 +118,47 @@ def upload_repository():
         if not file.filename.endswith('.zip'):
             return jsonify({'error': 'Please upload a ZIP file'}), 400
         
-        # Create temporary directory for extraction
-        temp_dir = tempfile.mkdtemp()
+        session_id = request.form.get('session_id', 'default')
+        
+        # Create temporary directory for extraction. The cache directory is made
+        # first so later cache writes never touch the repository root's mtime.
+        temp_dir = create_upload_dir(secure_filename(session_id)[:32])
+        os.mkdir(os.path.join(temp_dir, CACHE_DIR_NAME))
         zip_path = os.path.join(temp_dir, secure_filename(file.filename))
-        file.save(zip_path)
         
-        # Extract ZIP file
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_ref.extractall(temp_dir)
+        # Save and extract the ZIP file, removing the new directory on failure
+        try:
+            file.save(zip_path)
+            extract_zip(zip_path, temp_dir)
+        except (UnsafeZipEntryError, zipfile.BadZipFile) as e:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            return jsonify({'error': str(e)}), 400
+        except Exception:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            raise
         
         # Find the repository root (first directory with .git or containing source files)
         repo_path = find_repository_root(temp_dir)
         
         if not repo_path:
+            shutil.rmtree(temp_dir, ignore_errors=True)
             return jsonify({'error': 'No valid repository found in ZIP'}), 400
         
         # Store repository path in session
-        session_id = request.form.get('session_id', 'default')
         session_data = {
             'repo_path': str(repo_path),
             'temp_dir': temp_dir
         }
         
-        # In a real implementation, you'd store this in a database or cache
-        app.config['sessions'] = getattr(app.config, 'sessions', {})
-        app.config['sessions'][session_id] = session_data
+        # Sessions live on disk so every server worker can serve them
+        purge_expired_sessions()
+        prior = get_session(session_id)
+        set_session(session_id, session_data)
+        
+        # Drop the session's earlier upload only once the new one is in place,
+        # so a failed re-upload leaves the old session usable
+        if prior and prior.get('temp_dir'):
+            shutil.rmtree(prior['temp_dir'], ignore_errors=True)
         
         return jsonify({
             'success': True,
@@ -88,63 +174,98 @@ def analyze_repository():
     """Analyze repository for languages and issues."""
     try:
         session_id = request.json.get('session_id', 'default')
-        session_data = app.config.get('sessions', {}).get(session_id)
+        session_data = get_session(session_id)
         
         if not session_data:
             return jsonify({'error': 'No repository found. Please upload first.'}), 400
         
         repo_path = Path(session_data['repo_path'])
         
-        # Detect languages
-        languages = detect_languages(repo_path)
-        
-        # Run linters
+        # Detect languages; the walk is skipped when the upload is unchanged
+        cache_dir = Path(session_data['temp_dir']) / CACHE_DIR_NAME
+        repo_fingerprint = _repo_fingerprint(repo_path)
+        languages_cache = cache_dir / "languages.json"
+        languages = _load_cached_languages(languages_cache, repo_fingerprint)
+        if languages is None:
+            languages = detect_languages(repo_path)
+            _store_cached_languages(languages_cache, repo_fingerprint, languages)
+        
+        # Run linters. Per-file results are cached beside the upload rather
+        # than in the session, so the session file only carries the final issues.
         all_issues = {}
-        env_manager = EnvironmentManager()
-        
-        # Initialize new linters
-        go_linter = GoLinter(env_manager)
-        rust_linter = RustLinter(env_manager)
-        java_linter = JavaLinter(env_manager)
-        
-        for lang, files in languages.items():
-            file_paths = [str(f) for f in files]
+        lint_cache_path = cache_dir / "lint_cache.json"
+        old_cache = _load_lint_cache(lint_cache_path)
+        lint_cache = {}
+        stamps = {}
+        
+        # Collect one linter job per language with the files that changed since
+        # the last analysis, so environment setup and linter start-up are paid
+        # once per language and the jobs, which each shell out, can overlap
+        jobs = []
+        for lang, all_files in languages.items():
+            files = []
+            for file_path in all_files:
+                key = os.fspath(file_path)
+                stamp = _file_stamp(file_path)
+                cached = old_cache.get(key)
+                if stamp is not None and cached and cached['stamp'] == stamp:
+                    lint_cache[key] = cached
+                    all_issues.update(cached['issues'])
+                else:
+                    stamps[key] = stamp
+                    files.append(file_path)
+            if not files:
+                continue
             
+            # The run_*_linter wrappers take Path objects, the linter classes strings
             if lang == 'python':
-                issues = run_python_linter(file_paths, repo_path)
+                jobs.append((files, run_python_linter, files, repo_path))
             elif lang == 'javascript':
-                issues = run_js_linter(file_paths, repo_path)
+                jobs.append((files, run_js_linter, files, repo_path))
             elif lang == 'html':
-                issues = run_html_linter(file_paths, repo_path)
+                jobs.append((files, run_html_linter, files, repo_path))
             elif lang == 'css':
-                issues = run_css_linter(file_paths, repo_path)
+                jobs.append((files, run_css_linter, files, repo_path))
             elif lang == 'yaml':
-                issues = run_yaml_linter(file_paths, repo_path)
+                jobs.append((files, run_yaml_linter, files, repo_path))
             elif lang == 'go':
-                issues = go_linter.lint_files(repo_path, file_paths)
+                jobs.append((files, _get_linter(GoLinter).lint_files, repo_path, list(map(os.fspath, files))))
             elif lang == 'rust':
-                issues = rust_linter.lint_files(repo_path, file_paths)
+                jobs.append((files, _get_linter(RustLinter).lint_files, repo_path, list(map(os.fspath, files))))
             elif lang == 'java':
-                issues = java_linter.lint_files(repo_path, file_paths)
-            else:
-                continue
-            
-            all_issues.update(issues)
+                jobs.append((files, _get_linter(JavaLinter).lint_files, repo_path, list(map(os.fspath, files))))
+        
+        if jobs:
+            with ThreadPoolExecutor(max_workers=min(8, len(jobs))) as executor:
+                futures = {
+                    executor.submit(func, *args): files
+                    for files, func, *args in jobs
+                }
+                
+                # Merge in this thread so all_issues and lint_cache need no lock
+                for future in as_completed(futures):
+                    files = futures[future]
+                    issues = future.result()
+                    all_issues.update(issues)
+                    for key, file_issues in _issues_by_file(files, repo_path, issues).items():
+                        if stamps[key] is not None:
+                            lint_cache[key] = {'stamp': stamps[key], 'issues': file_issues}
+        
+        if jobs or lint_cache.keys() != old_cache.keys():
+            _write_cache_file(lint_cache_path, lint_cache)
         
         # Deduplicate and prioritize issues
         deduplicated_issues = {}
-        for file_path, issues in all_issues.items():
-            unique_issues = deduplicate_issues(issues)
-            prioritized_issues = prioritize_issues(unique_issues)
-            filtered_issues = filter_issues_by_severity(prioritized_issues, min_severity='low')
+        for file_path, unique_issues in deduplicate_issues(all_issues).items():
+            prioritized_issues, annotations = prioritize_issues_annotated(unique_issues)
+            filtered_issues = filter_issues_by_severity(prioritized_issues, min_severity='low', annotations=annotations)
             
             if filtered_issues:
                 deduplicated_issues[file_path] = filtered_issues
         
         # Update session data
-        session_data['languages'] = {lang: [str(f) for f in files] for lang, files in languages.items()}
         session_data['issues'] = deduplicated_issues
-        app.config['sessions'][session_id] = session_data
+        set_session(session_id, session_data)
         
         return jsonify({
             'success': True,
@@ -157,6 +278,116 @@ def analyze_repository():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _repo_fingerprint(repo_path: Path) -> List[int]:
+    """
+    Cheap fingerprint of an extracted upload.
+    
+    Uploads are not modified after extraction, so the root directory's stat
+    is enough to tell a re-analysis of the same upload from a new one.
+    """
+    stat = os.stat(repo_path)
+    return [stat.st_ino, stat.st_mtime_ns]
+
+def _load_cached_languages(cache_path: Path, repo_fingerprint: List[int]) -> Optional[Dict[str, List[Path]]]:
+    """
+    Load detected languages saved by an earlier analysis of the same upload.
+    
+    Args:
+        cache_path: Cache file inside the upload's temp directory
+        repo_fingerprint: Current fingerprint of the repository root
+    
+    Returns:
+        Dictionary mapping language names to file paths, or None on a miss
+    """
+    try:
+        cached = loads_json(cache_path.read_bytes())
+        if cached.get('fingerprint') != repo_fingerprint:
+            return None
+        return {lang: list(map(Path, files)) for lang, files in cached['languages'].items()}
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.debug(f"Ignoring unreadable language cache {cache_path}: {e}")
+        return None
+
+def _store_cached_languages(cache_path: Path, repo_fingerprint: List[int], languages: Dict[str, List[Path]]) -> None:
+    """Save detected languages next to the upload so re-analysis can skip the walk."""
+    _write_cache_file(cache_path, {'fingerprint': repo_fingerprint, 'languages': languages})
+
+def _load_lint_cache(cache_path: Path) -> Dict[str, Dict[str, Any]]:
+    """
+    Load per-file lint results saved by an earlier analysis of the same upload.
+    
+    Args:
+        cache_path: Cache file inside the upload's temp directory
+    
+    Returns:
+        Dictionary mapping file paths to their stamp and issues, empty when
+        nothing usable is cached
+    """
+    try:
+        return loads_json(cache_path.read_bytes())
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.debug(f"Ignoring unreadable lint cache {cache_path}: {e}")
+        return {}
+
+def _write_cache_file(cache_path: Path, data: Any) -> None:
+    """Atomically replace a cache file inside the upload's cache directory."""
+    try:
+        cache_path.parent.mkdir(exist_ok=True)
+        tmp_path = cache_path.with_suffix('.tmp')
+        tmp_path.write_bytes(dumps_json(data))
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        logger.warning(f"Failed to write cache {cache_path}: {e}")
+
+def _file_stamp(file_path: Path) -> Optional[List[int]]:
+    """Return a file's mtime and size, so lint results can be reused while both are unchanged."""
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+def _issues_by_file(files: List[Path], repo_path: Path, issues: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Split one linter run's results into a cache entry per linted file.
+    
+    Results are matched to files by absolute or repository-relative path.
+    Results for any other path, such as a failing test reported by pytest,
+    are kept with every file of the run so they are not lost while those
+    files stay unchanged.
+    
+    Args:
+        files: Files passed to the linter
+        repo_path: Path to the repository root
+        issues: Dictionary mapping file paths to lists of linting issues
+    
+    Returns:
+        Dictionary mapping each linted file to the results it owns
+    """
+    owners = {}
+    for file_path in files:
+        key = os.fspath(file_path)
+        owners[key] = key
+        owners[os.path.relpath(key, repo_path)] = key
+    
+    by_file = {os.fspath(file_path): {} for file_path in files}
+    unowned = {}
+    for name, file_issues in issues.items():
+        owner = owners.get(name)
+        if owner is None:
+            unowned[name] = file_issues
+        else:
+            by_file[owner][name] = file_issues
+    
+    if unowned:
+        for file_issues in by_file.values():
+            file_issues.update(unowned)
+    return by_file
+
 @app.route('/api/fix', methods=['POST'])
 def fix_issues():
     """Generate fixes for issues."""
@@ -165,25 +396,27 @@ def fix_issues():
         model = request.json.get('model', 'smollm2:135m')
         runner = request.json.get('runner', 'auto')
         timeout = request.json.get('timeout', 30)
+        # Each worker may start its own LLM process, so keep requests from
+        # asking for more than the machine can run
+        try:
+            parallel = int(request.json.get('parallel', 4))
+        except (TypeError, ValueError):
+            return jsonify({'error': 'parallel must be an integer'}), 400
+        parallel = max(1, min(parallel, os.cpu_count() or 1, MAX_FIX_WORKERS))
         
-        session_data = app.config.get('sessions', {}).get(session_id)
+        session_data = get_session(session_id)
         
         if not session_data or 'issues' not in session_data:
             return jsonify({'error': 'No analysis found. Please analyze first.'}), 400
         
-        repo_path = Path(session_data['repo_path'])
         issues = session_data['issues']
         
-        # Generate fixes
-        fixes = {}
-        for file_path, file_issues in issues.items():
-            fix = generate_fix(Path(file_path), file_issues, model, runner, timeout)
-            if fix:
-                fixes[file_path] = fix
+        # Generate fixes; LLM calls wait on the runner, so several files can be in flight
+        fixes = generate_fixes(issues.items(), model, runner, timeout, max_workers=parallel)
         
         # Update session data
         session_data['fixes'] = fixes
-        app.config['sessions'][session_id] = session_data
+        set_session(session_id, session_data)
         
         return jsonify({
             'success': True,
@@ -215,7 +448,7 @@ def download_fixes():
     """Download fixed files as ZIP."""
     try:
         session_id = request.json.get('session_id', 'default')
-        session_data = app.config.get('sessions', {}).get(session_id)
+        session_data = get_session(session_id)
         
         if not session_data or 'fixes' not in session_data:
             return jsonify({'error': 'No fixes found. Please generate fixes first.'}), 400
@@ -223,20 +456,11 @@ def download_fixes():
         repo_path = Path(session_data['repo_path'])
         fixes = session_data['fixes']
         
-        # Create temporary ZIP file
-        zip_path = tempfile.mktemp(suffix='.zip')
-        
-        with zipfile.ZipFile(zip_path, 'w') as zip_file:
-            for file_path, fixed_content in fixes.items():
-                # Add fixed file to ZIP
-                zip_file.writestr(f"fixed/{file_path}", fixed_content)
-                
-                # Also add original file for comparison
-                original_path = repo_path / file_path
-                if original_path.exists():
-                    zip_file.write(original_path, f"original/{file_path}")
-        
-        return send_file(zip_path, as_attachment=True, download_name='codefixer-fixes.zip')
+        return Response(
+            stream_fixes_zip(repo_path, fixes),
+            mimetype='application/zip',
+            headers={'Content-Disposition': 'attachment; filename=codefixer-fixes.zip'}
+        )
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -246,33 +470,190 @@ def cleanup_session():
     """Clean up session data and temporary files."""
     try:
         session_id = request.json.get('session_id', 'default')
-        session_data = app.config.get('sessions', {}).get(session_id)
+        session_data = delete_session(session_id)
         
         if session_data and 'temp_dir' in session_data:
             shutil.rmtree(session_data['temp_dir'], ignore_errors=True)
         
-        # Remove session data
-        if 'sessions' in app.config:
-            app.config['sessions'].pop(session_id, None)
-        
         return jsonify({'success': True})
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# Deflate level for downloads; source code shrinks 3-5x well before level 9
+DOWNLOAD_COMPRESSLEVEL = 6
+
+class _ZipChunkSink:
+    """Write-only file object that buffers ZIP output until the stream collects it."""
+    
+    def __init__(self):
+        self._chunks = []
+    
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+    
+    def flush(self) -> None:
+        pass
+    
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def stream_fixes_zip(repo_path: Path, fixes: Dict[str, str]):
+    """
+    Build the fixes ZIP incrementally, yielding bytes as each member is written.
+    
+    The sink has no tell() or seek(), so zipfile writes data descriptors and
+    the archive never has to exist as a whole on disk or in memory.
+    
+    Args:
+        repo_path: Root of the uploaded repository
+        fixes: Mapping of relative file path to fixed content
+    
+    Yields:
+        Chunks of the ZIP archive
+    """
+    sink = _ZipChunkSink()
+    with zipfile.ZipFile(sink, 'w', zipfile.ZIP_DEFLATED,
+                         compresslevel=DOWNLOAD_COMPRESSLEVEL) as zip_file:
+        for file_path, fixed_content in fixes.items():
+            # Add fixed file to ZIP
+            zip_file.writestr(f"fixed/{file_path}", fixed_content)
+            yield sink.drain()
+            
+            # Also add original file for comparison
+            original_path = repo_path / file_path
+            if original_path.exists():
+                zip_file.write(original_path, f"original/{file_path}")
+                yield sink.drain()
+    
+    # Central directory is written on close
+    yield sink.drain()
+
+class UnsafeZipEntryError(ValueError):
+    """Raised when a ZIP entry would be extracted outside the target directory."""
+
+def _safe_join(root: str, name: str) -> str:
+    """Join an archive member name to a resolved root, rejecting path traversal."""
+    target = os.path.realpath(os.path.join(root, name))
+    if os.path.commonpath([target, root]) != root:
+        raise UnsafeZipEntryError(f"ZIP entry escapes extraction directory: {name}")
+    return target
+
+# Archives with at least this many files are extracted by a thread pool
+PARALLEL_EXTRACT_MIN_FILES = 64
+
+# Copy buffer size for each extraction thread
+EXTRACT_BUFFER_SIZE = 1 << 20
+
+def _copy_member(zip_ref: zipfile.ZipFile, info: zipfile.ZipInfo, target: str, buffer: memoryview) -> None:
+    """Copy one archive member to target through a reusable buffer."""
+    with zip_ref.open(info) as src, open(target, 'wb') as dst:
+        while True:
+            read = src.readinto(buffer)
+            if not read:
+                break
+            dst.write(buffer[:read])
+
+def extract_zip(zip_path: str, directory: str) -> None:
+    """
+    Extract a ZIP archive into directory.
+    
+    Member names are checked and directories created up front. Files are
+    then copied through a reused 1MB buffer, and empty files are created
+    without reading the archive. Large archives are extracted by a thread
+    pool; zlib releases the GIL while inflating, and each thread keeps its
+    own ZipFile handle because one handle cannot be read concurrently.
+    
+    If a member fails, the remaining copies are cancelled and the error is
+    raised; directory is left partly written and the caller must remove it.
+    
+    Raises:
+        UnsafeZipEntryError: If a member name points outside directory or
+            the member is a symbolic link
+    """
+    root = os.path.realpath(directory)
+    members = []
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        for info in zip_ref.infolist():
+            target = _safe_join(root, info.filename)
+            if stat.S_ISLNK(info.external_attr >> 16):
+                raise UnsafeZipEntryError(f"ZIP entry is a symbolic link: {info.filename}")
+            if info.is_dir():
+                os.makedirs(target, exist_ok=True)
+                continue
+            
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            if info.file_size == 0:
+                open(target, 'wb').close()
+                continue
+            
+            members.append((info, target))
+        
+        if len(members) < PARALLEL_EXTRACT_MIN_FILES:
+            buffer = memoryview(bytearray(EXTRACT_BUFFER_SIZE))
+            for info, target in members:
+                _copy_member(zip_ref, info, target, buffer)
+            return
+    
+    local = threading.local()
+    handles = []
+    
+    def extract_member(info: zipfile.ZipInfo, target: str) -> None:
+        if not hasattr(local, 'zip_ref'):
+            local.zip_ref = zipfile.ZipFile(zip_path, 'r')
+            local.buffer = memoryview(bytearray(EXTRACT_BUFFER_SIZE))
+            handles.append(local.zip_ref)
+        _copy_member(local.zip_ref, info, target, local.buffer)
+    
+    try:
+        with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as executor:
+            futures = [executor.submit(extract_member, info, target) for info, target in members]
+            try:
+                for future in futures:
+                    future.result()
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+    finally:
+        for handle in handles:
+            handle.close()
+
 def find_repository_root(directory: str) -> Path:
-    """Find the repository root in the extracted directory."""
-    for root, dirs, files in os.walk(directory):
-        # Check if this directory contains a .git folder
-        if '.git' in dirs:
-            return Path(root)
-        
-        # Check if this directory contains source files
-        source_files = [f for f in files if f.endswith(('.py', '.js', '.ts', '.java', '.go', '.rs'))]
-        if source_files:
-            return Path(root)
+    """
+    Find the repository root in the extracted directory.
+    
+    Directories are searched breadth first with os.scandir, returning as
+    soon as one holds a .git folder or a source file, so the shallowest
+    match wins and the rest of the tree is never listed.
+    """
+    queue = deque([directory])
+    while queue:
+        current = queue.popleft()
+        subdirs = []
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        # Check if this directory contains a .git folder
+                        if entry.name == '.git':
+                            return Path(current)
+                        subdirs.append(entry.path)
+                    else:
+                        # Check if this directory contains source files
+                        name = entry.name
+                        if name[name.rfind('.'):] in _SRC_SUFFIXES:
+                            return Path(current)
+        except OSError:
+            continue
+        
+        queue.extend(subdirs)
     
     return None
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000) 
\ No newline at end of file
+    # Development server only; see the README for running under gunicorn
+    app.run(debug=True, host='0.0.0.0', port=5000, threaded=True) 
\ No newline at end of file